@@ -1,21 +1,20 @@
 from app.models.models import Company
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.database import db_writer
 
 
 def set_liked_companies(names: list[str]) -> dict:
-    db: Session = SessionLocal()
-    success, fail = 0, 0
+    def mark_liked(db: Session) -> dict:
+        found = {
+            name for (name,) in
+            db.query(Company.company_name).filter(Company.company_name.in_(set(names)))
+        }
+        if found:
+            db.query(Company).filter(Company.company_name.in_(found)).update(
+                {Company.is_liked: True}, synchronize_session=False
+            )
 
-    for name in names:
-        company = db.query(Company).filter_by(company_name=name).first()
-        if company:
-            company.is_liked = True
-            db.add(company)
-            success += 1
-        else:
-            fail += 1
+        success = sum(1 for name in names if name in found)
+        return {"updated": success, "not_found": len(names) - success}
 
-    db.commit()
-    db.close()
-    return {"updated": success, "not_found": fail}
\ No newline at end of file
+    return db_writer.run(mark_liked)
@@ -0,0 +1,52 @@
+from datetime import date
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models.models import StockIndicator, IndicatorState
+
+UPSERT_BATCH_SIZE = 1000
+INDICATOR_FIELDS = tuple(
+    c.name for c in StockIndicator.__table__.columns if c.name not in ("id", "stock_code")
+)
+
+
+def _upsert(db: Session, model, rows: list[dict], keys: list[str]):
+    if not rows:
+        return
+    stmt = sqlite_insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={key: stmt.excluded[key] for key in rows[0] if key not in keys},
+    )
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        db.execute(stmt, rows[i:i + UPSERT_BATCH_SIZE])
+
+
+def upsert_indicators(db: Session, rows: list[dict]):
+    _upsert(db, StockIndicator, rows, ["stock_code", "trade_date"])
+
+
+def upsert_indicator_states(db: Session, rows: list[dict]):
+    _upsert(db, IndicatorState, rows, ["stock_code"])
+
+
+def get_indicators(
+    db: Session,
+    stock_code: str,
+    start: date | None = None,
+    end: date | None = None,
+    after: date | None = None,
+    limit: int = 500,
+    fields: tuple[str, ...] = INDICATOR_FIELDS,
+) -> list[dict]:
+    table = StockIndicator.__table__
+    columns = [table.c.trade_date] + [table.c[f] for f in fields if f != "trade_date"]
+    stmt = select(*columns).where(table.c.stock_code == stock_code)
+    if start:
+        stmt = stmt.where(table.c.trade_date >= start)
+    if end:
+        stmt = stmt.where(table.c.trade_date <= end)
+    if after:
+        stmt = stmt.where(table.c.trade_date > after)
+    stmt = stmt.order_by(table.c.trade_date).limit(limit)
+    return [dict(row) for row in db.execute(stmt).mappings()]
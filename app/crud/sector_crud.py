@@ -0,0 +1,117 @@
+import time
+from bisect import bisect_right
+from datetime import date
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session, aliased
+from app.models.models import Sector, SectorDaily, Stock
+
+# SQLite 바인드 변수 수 제한을 넘지 않도록 날짜를 나눠서 처리
+DATE_CHUNK_SIZE = 500
+SECTOR_DAILY_FIELDS = (
+    "trade_date",
+    "stock_count",
+    "total_market_cap",
+    "total_trade_value",
+    "total_volume",
+    "avg_return",
+)
+
+
+def _with_next_dates(db: Session, dates: set[date]) -> list[date]:
+    # 어떤 날짜의 종가가 바뀌면 다음 거래일 수익률도 달라짐
+    # 저장된 거래일을 한 번에 읽어(trade_date 인덱스) 다음 거래일은 이분 탐색으로 찾음
+    stored = list(db.scalars(select(Stock.trade_date.distinct()).order_by(Stock.trade_date)))
+    result = set(dates)
+    for d in dates:
+        i = bisect_right(stored, d)
+        if i < len(stored):
+            result.add(stored[i])
+    return sorted(result)
+
+
+def _aggregate(dates: list[date], sector_ids: list[int] | None):
+    prev = aliased(Stock)
+    prev_close = (
+        select(prev.closing_price)
+        .where(prev.stock_code == Stock.stock_code, prev.trade_date < Stock.trade_date)
+        .order_by(prev.trade_date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    daily_return = case((prev_close > 0, Stock.closing_price / prev_close - 1))
+
+    stmt = (
+        select(
+            Stock.sector_id,
+            Stock.trade_date,
+            func.count(),
+            func.sum(Stock.market_cap),
+            func.sum(Stock.trade_value),
+            func.sum(Stock.trading_volume),
+            func.avg(daily_return),
+        )
+        .where(Stock.trade_date.in_(dates), Stock.sector_id.isnot(None))
+        .group_by(Stock.sector_id, Stock.trade_date)
+    )
+    if sector_ids is not None:
+        stmt = stmt.where(Stock.sector_id.in_(sector_ids))
+    return stmt
+
+
+def refresh_sector_daily(db: Session, trade_dates, stock_codes=None) -> int:
+    """해당 날짜(와 그 다음 거래일)의 sector_daily 를 다시 집계 — stock_codes 가 있으면 그 종목들의 섹터만"""
+    if not trade_dates:
+        return 0
+    started = time.perf_counter()
+    dates = _with_next_dates(db, set(trade_dates))
+
+    sector_ids = None
+    if stock_codes is not None:
+        sector_ids = list(db.scalars(
+            select(Stock.sector_id.distinct())
+            .where(Stock.stock_code.in_(list(stock_codes)), Stock.sector_id.isnot(None))
+        ))
+        if not sector_ids:
+            return 0
+
+    columns = ["sector_id", "trade_date", *SECTOR_DAILY_FIELDS[1:]]
+    saved = 0
+    for i in range(0, len(dates), DATE_CHUNK_SIZE):
+        chunk = dates[i:i + DATE_CHUNK_SIZE]
+        # 종목이 빠진 섹터/날짜가 남지 않도록 지우고 다시 채움
+        stale = delete(SectorDaily).where(SectorDaily.trade_date.in_(chunk))
+        if sector_ids is not None:
+            stale = stale.where(SectorDaily.sector_id.in_(sector_ids))
+        db.execute(stale)
+        saved += db.execute(insert(SectorDaily).from_select(columns, _aggregate(chunk, sector_ids))).rowcount
+
+    elapsed = time.perf_counter() - started
+    print(f"🏷️ 섹터 집계 갱신: {len(dates)}일 / {saved}행 / {elapsed:.3f}s")
+    return saved
+
+
+def get_sectors(db: Session) -> list[dict]:
+    return [
+        {"id": s.id, "sector_name": s.sector_name}
+        for s in db.query(Sector).order_by(Sector.sector_name)
+    ]
+
+
+def get_sector_daily(
+    db: Session,
+    sector_id: int,
+    start: date | None = None,
+    end: date | None = None,
+    after: date | None = None,
+    limit: int = 500,
+) -> list[dict]:
+    table = SectorDaily.__table__
+    stmt = select(*(table.c[f] for f in SECTOR_DAILY_FIELDS)).where(table.c.sector_id == sector_id)
+    if start:
+        stmt = stmt.where(table.c.trade_date >= start)
+    if end:
+        stmt = stmt.where(table.c.trade_date <= end)
+    if after:
+        stmt = stmt.where(table.c.trade_date > after)
+    stmt = stmt.order_by(table.c.trade_date).limit(limit)
+    return [dict(row) for row in db.execute(stmt).mappings()]
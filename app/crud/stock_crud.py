@@ -1,23 +1,158 @@
+import time
+from datetime import date
 import pandas as pd
-from app.models.models import Stock, Company
+from sqlalchemy import bindparam, delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models.models import Stock, Company, DerivedPending
+from app.services.price_parser import PRICE_COLUMNS
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
-
-
-def save_stock_records(db: Session, company: Company, df: pd.DataFrame):
-    for _, row in df.iterrows():
-        stock = Stock(
-            stock_name=company.company_name,
-            stock_code=company.company_code,
-            sector_id=company.sector_id,
-            trade_date=pd.to_datetime(row["일자"]),
-            opening_price=float(str(row["시가"]).replace(",", "") or 0),
-            highest_price=float(str(row["고가"]).replace(",", "") or 0),
-            lowest_price=float(str(row["저가"]).replace(",", "") or 0),
-            closing_price=float(str(row["종가"]).replace(",", "") or 0),
-            trading_volume=int(str(row["거래량"]).replace(",", "") or 0),
-            trade_value=int(str(row["거래대금"]).replace(",", "") or 0),
-            market_cap=int(str(row["시가총액"]).replace(",", "") or 0),
-        )
-        db.add(stock)
-    db.commit()
\ No newline at end of file
+
+UPSERT_BATCH_SIZE = 1000
+UPSERT_KEYS = ("stock_code", "trade_date")
+
+PRICE_FIELDS = tuple(PRICE_COLUMNS)
+
+
+def _to_records(frame: pd.DataFrame) -> list[dict]:
+    # 값이 전혀 없는 컬럼(네이버의 거래대금 등)은 빼서 upsert 가 기존 값을 덮지 않게 함
+    frame = frame.dropna(axis=1, how="all")
+    if "trade_date" in frame.columns:
+        frame = frame.assign(trade_date=frame["trade_date"].dt.date)
+    return frame.to_dict("records")
+
+
+def build_stock_rows(company: Company, df: pd.DataFrame) -> list[dict]:
+    """표준 컬럼 시세(price_parser) → 해당 회사의 stocks 행"""
+    frame = df[list(PRICE_COLUMNS)].assign(
+        stock_name=company.company_name,
+        stock_code=company.company_code,
+        sector_id=company.sector_id,
+    )
+    return _to_records(frame)
+
+
+def build_market_rows(db: Session, df: pd.DataFrame, trade_date: date) -> list[dict]:
+    """전종목 시세(하루치)를 종목코드/ISIN 으로 companies 에 매핑해 stocks 행으로 변환"""
+    companies = pd.DataFrame(
+        db.query(Company.company_code, Company.isin_code, Company.company_name, Company.sector_id).all(),
+        columns=["company_code", "isin_code", "company_name", "sector_id"],
+    ).set_index("company_code")
+
+    codes = df["stock_code"]
+    if "isin_code" in df.columns:
+        # 단축코드로 못 찾은 종목은 ISIN 으로 한 번 더 매핑
+        # ISIN 이 없는 회사는 빼고, 같은 ISIN 이 여러 번이면 첫 회사만 (map 은 유일한 인덱스가 필요)
+        with_isin = companies.dropna(subset=["isin_code"])
+        code_by_isin = pd.Series(with_isin.index, index=with_isin["isin_code"])
+        code_by_isin = code_by_isin[~code_by_isin.index.duplicated()]
+        codes = codes.where(codes.isin(companies.index), df["isin_code"].map(code_by_isin))
+
+    found = codes.isin(companies.index)
+    codes = codes[found]
+    sector_ids = codes.map(companies["sector_id"]).astype("Int64")
+    frame = df.loc[found, list(PRICE_COLUMNS[1:])].assign(
+        stock_name=codes.map(companies["company_name"]),
+        stock_code=codes,
+        sector_id=sector_ids.astype(object).where(sector_ids.notna(), None),
+        trade_date=pd.Timestamp(trade_date),
+    )
+    return _to_records(frame)
+
+
+def bulk_upsert_stocks(db: Session, rows: list[dict], batch_size: int = UPSERT_BATCH_SIZE) -> int:
+    if not rows:
+        return 0
+
+    stmt = sqlite_insert(Stock)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(UPSERT_KEYS),
+        set_={key: stmt.excluded[key] for key in rows[0] if key not in UPSERT_KEYS},
+    )
+    for i in range(0, len(rows), batch_size):
+        db.execute(stmt, rows[i:i + batch_size])
+    return len(rows)
+
+
+def save_stock_records(db: Session, company: Company, df: pd.DataFrame) -> list[date]:
+    started = time.perf_counter()
+    rows = build_stock_rows(company, df)
+    saved = bulk_upsert_stocks(db, rows)
+
+    elapsed = time.perf_counter() - started
+    print(f"⏱️ {company.company_code}: {saved}행 / {elapsed:.3f}s ({saved / max(elapsed, 1e-9):,.0f} rows/s)")
+    return [row["trade_date"] for row in rows]
+
+
+def get_latest_trade_dates(db: Session, stock_codes: list[str]) -> dict[str, date]:
+    rows = (
+        db.query(Stock.stock_code, func.max(Stock.trade_date))
+        .filter(Stock.stock_code.in_(stock_codes))
+        .group_by(Stock.stock_code)
+        .all()
+    )
+    return dict(rows)
+
+
+def get_price_history(
+    db: Session,
+    stock_code: str,
+    start: date | None = None,
+    end: date | None = None,
+    after: date | None = None,
+    limit: int = 500,
+    fields: tuple[str, ...] = PRICE_FIELDS,
+) -> list[dict]:
+    # (stock_code, trade_date) 인덱스 범위 스캔 + keyset 페이지네이션 (OFFSET 없음)
+    table = Stock.__table__
+    columns = [table.c.trade_date] + [table.c[f] for f in fields if f != "trade_date"]
+    stmt = select(*columns).where(table.c.stock_code == stock_code)
+    if start:
+        stmt = stmt.where(table.c.trade_date >= start)
+    if end:
+        stmt = stmt.where(table.c.trade_date <= end)
+    if after:
+        stmt = stmt.where(table.c.trade_date > after)
+    stmt = stmt.order_by(table.c.trade_date).limit(limit)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def mark_derived_pending(db: Session, since_by_code: dict[str, date]):
+    """시세 저장과 같은 트랜잭션에서 호출 — 파생 데이터를 다시 계산할 종목과 시작일 기록"""
+    if not since_by_code:
+        return
+    table = DerivedPending.__table__
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["stock_code"],
+        # 더 이른 날짜를 유지하고, 처리 중에 새로 기록된 것은 version 으로 구분
+        set_={"since": func.min(table.c.since, stmt.excluded.since), "version": table.c.version + 1},
+    )
+    rows = [{"stock_code": code, "since": since, "version": 0} for code, since in since_by_code.items()]
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        db.execute(stmt, rows[i:i + UPSERT_BATCH_SIZE])
+
+
+def get_derived_pending(db: Session, stock_codes=None) -> dict[str, tuple[date, int]]:
+    """종목코드 → (since, version)"""
+    stmt = select(DerivedPending.stock_code, DerivedPending.since, DerivedPending.version)
+    if stock_codes is not None:
+        stmt = stmt.where(DerivedPending.stock_code.in_(list(stock_codes)))
+    return {code: (since, version) for code, since, version in db.execute(stmt)}
+
+
+def clear_derived_pending(db: Session, pending: dict[str, tuple[date, int]]):
+    """반영을 마친 기록만 지움 — 그 사이 다시 기록된(version 이 바뀐) 종목은 남김"""
+    if not pending:
+        return
+    table = DerivedPending.__table__
+    stmt = delete(table).where(table.c.stock_code == bindparam("code"), table.c.version == bindparam("ver"))
+    db.execute(stmt, [{"code": code, "ver": version} for code, (_, version) in pending.items()])
+
+
+def get_trade_dates(db: Session, stock_codes, since: date) -> list[date]:
+    """해당 종목들의 since 이후 거래일"""
+    return list(db.scalars(
+        select(Stock.trade_date.distinct())
+        .where(Stock.stock_code.in_(list(stock_codes)), Stock.trade_date >= since)
+        .order_by(Stock.trade_date)
+    ))
@@ -1,9 +1,109 @@
-from sqlalchemy import create_engine
+import queue
+import threading
+from concurrent.futures import Future
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./data/stocks.db"
 
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",       # 읽기와 쓰기가 서로 막지 않도록
+    "synchronous": "NORMAL",     # WAL 에서는 NORMAL 로도 커밋 내구성 충분
+    "busy_timeout": 5000,        # 잠금 충돌 시 바로 실패하지 않고 대기 (ms)
+    "temp_store": "MEMORY",
+    "cache_size": -64000,        # 64MB
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+
+def configure_sqlite(engine, pragmas: dict = SQLITE_PRAGMAS):
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # pysqlite 의 암묵적 트랜잭션을 끄고 BEGIN 은 SQLAlchemy 가 직접 보냄 (SAVEPOINT 정상 동작)
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+class SingleWriter:
+    """모든 쓰기를 전용 스레드 하나에서 처리하고, 쌓인 작업은 한 트랜잭션으로 묶어서 커밋"""
+
+    def __init__(self, session_factory, max_batch: int = 256):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn) -> Future:
+        """fn(session) 을 쓰기 스레드에서 실행 — commit 은 writer 가 하므로 fn 에서 호출하지 않음"""
+        future = Future()
+        self._ensure_started()
+        self._queue.put((fn, future))
+        return future
+
+    def run(self, fn):
+        return self.submit(fn).result()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def _drain(self) -> list:
+        batch = [self._queue.get()]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._drain()
+            session = None
+            done = []
+            try:
+                session = self.session_factory()
+                for fn, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    # 작업 하나가 실패해도 같은 배치의 다른 작업은 커밋되도록 savepoint 로 분리
+                    savepoint = session.begin_nested()
+                    try:
+                        result = fn(session)
+                        savepoint.commit()
+                        done.append((future, result))
+                    except Exception as e:
+                        savepoint.rollback()
+                        future.set_exception(e)
+                session.commit()
+                for future, result in done:
+                    future.set_result(result)
+            except Exception as e:
+                # 세션 생성이나 커밋이 실패해도 스레드는 살려 두고, 이 배치에서 결과가 없는 작업만 같은 예외로 끝냄
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                if session is not None:
+                    try:
+                        session.close()  # 커밋하지 못한 트랜잭션은 여기서 롤백됨
+                    except Exception as e:
+                        print(f"❌ 쓰기 세션 정리 실패: {e}")
+
+
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
\ No newline at end of file
+configure_sqlite(engine)
+SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+db_writer = SingleWriter(SessionLocal)
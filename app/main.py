@@ -3,8 +3,14 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 
 from app.routes.companies import router as company_router
 from app.routes.stocks import router as stock_router
+from app.routes.jobs import router as job_router
+from app.routes.sectors import router as sector_router
+from app.routes.watchlist import router as watchlist_router
 
 app = FastAPI(title="Stock Assistance")
 
 app.include_router(company_router)
-app.include_router(stock_router)
\ No newline at end of file
+app.include_router(stock_router)
+app.include_router(job_router)
+app.include_router(sector_router)
+app.include_router(watchlist_router)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Float, Boolean
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Float, Boolean, Index
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -40,10 +40,15 @@ class Company(Base):
 
 class Stock(Base):
     __tablename__ = "stocks"
+    __table_args__ = (
+        # 같은 종목의 같은 날짜 시세는 한 번만 저장 (upsert 기준 키)
+        # 종목별 기간 조회도 이 인덱스를 사용하므로 stock_code 단일 인덱스는 두지 않음
+        Index("ux_stocks_code_date", "stock_code", "trade_date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     stock_name = Column(String, nullable=False)
-    stock_code = Column(String, index=True, nullable=False)
+    stock_code = Column(String, nullable=False)
     sector_id = Column(Integer, ForeignKey("sectors.id"))
     trade_date = Column(Date, index=True, nullable=False)
     closing_price = Column(Float)
@@ -57,6 +62,74 @@ class Stock(Base):
     sector = relationship("Sector", back_populates="stocks")
 
 
+class StockIndicator(Base):
+    __tablename__ = "stock_indicators"
+    __table_args__ = (
+        Index("ux_stock_indicators_code_date", "stock_code", "trade_date", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    stock_code = Column(String, nullable=False)
+    trade_date = Column(Date, nullable=False)
+    sma_5 = Column(Float)
+    sma_20 = Column(Float)
+    sma_60 = Column(Float)
+    ema_12 = Column(Float)
+    ema_26 = Column(Float)
+    macd = Column(Float)
+    macd_signal = Column(Float)
+    macd_hist = Column(Float)
+    rsi_14 = Column(Float)
+    bb_upper = Column(Float)
+    bb_middle = Column(Float)
+    bb_lower = Column(Float)
+    atr_14 = Column(Float)
+    volume_ma_20 = Column(Float)
+
+
+class IndicatorState(Base):
+    # 증분 계산용 — 마지막 봉 기준 EMA/RSI/ATR 누적 상태
+    __tablename__ = "indicator_states"
+
+    stock_code = Column(String, primary_key=True)
+    last_date = Column(Date, nullable=False)
+    bars = Column(Integer, nullable=False)
+    prev_close = Column(Float)
+    ema_12 = Column(Float)
+    ema_26 = Column(Float)
+    macd_signal = Column(Float)
+    avg_gain = Column(Float)
+    avg_loss = Column(Float)
+    atr = Column(Float)
+
+
+class SectorDaily(Base):
+    # stocks 를 섹터/날짜별로 미리 집계한 테이블 (수집된 날짜만 증분 갱신)
+    __tablename__ = "sector_daily"
+    __table_args__ = (
+        Index("ux_sector_daily_sector_date", "sector_id", "trade_date", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    sector_id = Column(Integer, ForeignKey("sectors.id"), nullable=False)
+    trade_date = Column(Date, nullable=False)
+    stock_count = Column(Integer)
+    total_market_cap = Column(Integer)
+    total_trade_value = Column(Integer)
+    total_volume = Column(Integer)
+    avg_return = Column(Float)
+
+
+class DerivedPending(Base):
+    # 시세는 저장됐지만 파생 데이터(컬럼 저장소/지표/섹터 집계)에 아직 반영되지 않은 종목
+    # 시세 저장과 같은 트랜잭션에 기록하므로 수집이 중간에 죽어도 다음 실행에서 이어서 반영
+    __tablename__ = "derived_pending"
+
+    stock_code = Column(String, primary_key=True)
+    since = Column(Date, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+
+
 class DailyNote(Base):
     __tablename__ = "daily_notes"
 
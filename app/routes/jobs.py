@@ -0,0 +1,12 @@
+from fastapi import APIRouter, HTTPException
+from app.services.job_service import job_manager
+
+router = APIRouter()
+
+
+@router.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
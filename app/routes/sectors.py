@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from datetime import date
+from app.crud.sector_crud import get_sectors, get_sector_daily
+from app.database import SessionLocal
+from app.models.models import Sector
+
+router = APIRouter()
+
+
+@router.get("/api/sectors")
+def list_sectors():
+    db = SessionLocal()
+    try:
+        return {"sectors": get_sectors(db)}
+    finally:
+        db.close()
+
+
+@router.get("/api/sectors/{sector_id}/daily")
+def get_sector_series(
+    sector_id: int,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    after: Optional[date] = None,
+    limit: int = Query(500, ge=1, le=5000),
+):
+    db = SessionLocal()
+    try:
+        sector = db.get(Sector, sector_id)
+        if sector is None:
+            raise HTTPException(status_code=404, detail="Sector not found")
+        rows = get_sector_daily(db, sector_id, start, end, after, limit)
+    finally:
+        db.close()
+
+    next_cursor = rows[-1]["trade_date"] if len(rows) == limit else None
+    return {"sector_id": sector_id, "sector_name": sector.sector_name, "daily": rows, "next_cursor": next_cursor}
@@ -1,7 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from typing import List
-from app.services.stock_service import save_init_stock_price
+from typing import List, Optional
+from datetime import date
+from app.crud.indicator_crud import get_indicators, INDICATOR_FIELDS
+from app.crud.stock_crud import get_price_history, PRICE_FIELDS
+from app.database import SessionLocal
+from app.services.job_service import job_manager
+from app.services.stock_service import save_init_stock_price, sync_stock_price
 
 router = APIRouter()
 
@@ -10,7 +15,72 @@ class StockInitRequest(BaseModel):
     stocks: List[str]
     
 
-@router.post("/api/stocks/init-price-data")
+@router.post("/api/stocks/init-price-data", status_code=202)
 def init_price_data(request: StockInitRequest):
-    result = save_init_stock_price(request.stocks)
-    return result
\ No newline at end of file
+    codes = list(dict.fromkeys(request.stocks))
+    job = job_manager.submit(
+        "init-price-data",
+        codes,
+        lambda job: save_init_stock_price(codes, on_progress=job.record),
+    )
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.post("/api/stocks/sync-price-data", status_code=202)
+def sync_price_data(request: StockInitRequest):
+    codes = list(dict.fromkeys(request.stocks))
+    job = job_manager.submit(
+        "sync-price-data",
+        codes,
+        lambda job: sync_stock_price(codes, on_progress=job.record),
+    )
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.get("/api/stocks/{code}/prices")
+def get_prices(
+    code: str,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    after: Optional[date] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    fields: Optional[str] = None,
+):
+    selected = tuple(fields.split(",")) if fields else PRICE_FIELDS
+    unknown = [f for f in selected if f not in PRICE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    db = SessionLocal()
+    try:
+        rows = get_price_history(db, code, start, end, after, limit, selected)
+    finally:
+        db.close()
+
+    next_cursor = rows[-1]["trade_date"] if len(rows) == limit else None
+    return {"code": code, "prices": rows, "next_cursor": next_cursor}
+
+
+
+@router.get("/api/stocks/{code}/indicators")
+def get_stock_indicators(
+    code: str,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    after: Optional[date] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    fields: Optional[str] = None,
+):
+    selected = tuple(fields.split(",")) if fields else INDICATOR_FIELDS
+    unknown = [f for f in selected if f not in INDICATOR_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    db = SessionLocal()
+    try:
+        rows = get_indicators(db, code, start, end, after, limit, selected)
+    finally:
+        db.close()
+
+    next_cursor = rows[-1]["trade_date"] if len(rows) == limit else None
+    return {"code": code, "indicators": rows, "next_cursor": next_cursor}
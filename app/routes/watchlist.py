@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from app.database import SessionLocal
+from app.services.watchlist_service import get_watchlist
+
+router = APIRouter()
+
+
+@router.get("/api/watchlist")
+def watchlist():
+    # 캐시가 살아 있으면 세션만 만들고 DB 연결은 하지 않음
+    db = SessionLocal()
+    try:
+        return {"watchlist": get_watchlist(db)}
+    finally:
+        db.close()
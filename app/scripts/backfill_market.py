@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from app.database import SessionLocal
+from app.services.krx_client import KrxClient, DEFAULT_MAX_WORKERS
+from app.services.stock_service import save_market_snapshot, last_trading_day, flush_derived
+
+JOURNAL_PATH = "data/market_backfill.journal"
+
+
+def load_journal(path: str) -> set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {json.loads(line)["date"] for line in f if line.strip()}
+
+
+def append_journal(path: str, trade_date: str, rows: int):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"date": trade_date, "rows": rows, "at": datetime.now().isoformat(timespec="seconds")}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def trading_days(start, end) -> list[str]:
+    days = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            days.append(day.strftime("%Y%m%d"))
+        day += timedelta(days=1)
+    return days
+
+
+def backfill_market(start, end, journal_path: str = JOURNAL_PATH, max_workers: int = DEFAULT_MAX_WORKERS) -> dict:
+    done = load_journal(journal_path)
+    pending = [d for d in trading_days(start, end) if d not in done]
+    print(f"📅 대상 {len(pending)}일 (완료 기록 {len(done)}일 건너뜀)")
+
+    client = KrxClient(max_workers=max_workers)
+    db = SessionLocal()
+    success, fail, total_rows = 0, 0, 0
+    touched_codes = set()
+
+    # 이전 실행이 파생 데이터 갱신 전에 죽었으면 저널에 완료로 남은 날짜도 여기서 반영
+    replayed = flush_derived(db)
+    if replayed:
+        print(f"♻️ 이전 실행에서 남은 파생 데이터 갱신: {replayed}종목")
+
+    try:
+        # 다운로드는 병렬, 저장과 저널 기록은 이 스레드에서 순차 처리
+        for trade_date, res, error in client.fetch_many(client.fetch_market_snapshot, pending):
+            try:
+                if error:
+                    raise error
+                day = datetime.strptime(trade_date, "%Y%m%d").date()
+                # 시세와 파생 데이터 대기 기록(derived_pending)이 한 트랜잭션으로 저장된 뒤에만 저널에 기록
+                codes = save_market_snapshot(db, day, res)
+                append_journal(journal_path, trade_date, len(codes))
+                total_rows += len(codes)
+                success += 1
+                touched_codes.update(codes)
+            except Exception as e:
+                print(f"❌ 오류 발생 ({trade_date}): {e}")
+                db.rollback()
+                fail += 1
+    finally:
+        # 파생 데이터는 날짜마다가 아니라 백필이 끝난 뒤(중간에 실패해도) 종목 묶음 단위로 갱신
+        if touched_codes:
+            flush_derived(db, touched_codes)
+        db.close()
+
+    print(f"\n📊 완료: 성공={success}일, 실패={fail}일, 저장={total_rows}행")
+    return {"success": success, "fail": fail, "rows": total_rows}
+
+
+def main():
+    today = datetime.today().date()
+    parser = argparse.ArgumentParser(description="KRX 전종목 일별 시세 백필")
+    parser.add_argument("--start", help="YYYYMMDD (기본: 마지막 거래일)")
+    parser.add_argument("--end", help="YYYYMMDD (기본: 마지막 거래일)")
+    parser.add_argument("--journal", default=JOURNAL_PATH)
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS)
+    args = parser.parse_args()
+
+    end = datetime.strptime(args.end, "%Y%m%d").date() if args.end else last_trading_day(today)
+    start = datetime.strptime(args.start, "%Y%m%d").date() if args.start else end
+    backfill_market(start, end, args.journal, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from app.crud.stock_crud import bulk_upsert_stocks
+from app.database import configure_sqlite, SingleWriter
+from app.models.models import Base, Stock
+
+CODES = [f"{i:06d}" for i in range(50)]
+DAYS = [date(2024, 1, 1) + timedelta(days=i) for i in range(250)]
+
+
+def _row(code: str, day: date) -> dict:
+    price = random.uniform(1000, 100000)
+    return {
+        "stock_name": code, "stock_code": code, "sector_id": None, "trade_date": day,
+        "opening_price": price, "highest_price": price, "lowest_price": price, "closing_price": price,
+        "trading_volume": 1, "trade_value": 1, "market_cap": 1,
+    }
+
+
+def _make_db(path: str, tuned: bool):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if tuned:
+        configure_sqlite(engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    with Session() as db:
+        bulk_upsert_stocks(db, [_row(c, d) for c in CODES for d in DAYS])
+        db.commit()
+    return engine, Session
+
+
+def run(tuned: bool, readers: int = 4, writers: int = 4, seconds: float = 5.0) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine, Session = _make_db(path, tuned)
+    writer = SingleWriter(Session) if tuned else None
+    stop = time.monotonic() + seconds
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def read_loop():
+        with Session() as db:
+            while time.monotonic() < stop:
+                try:
+                    code = random.choice(CODES)
+                    db.execute(select(Stock.trade_date, Stock.closing_price).where(Stock.stock_code == code)).all()
+                    db.rollback()
+                    bump("reads")
+                except Exception:
+                    db.rollback()
+                    bump("errors")
+
+    def write_loop():
+        with Session() as db:
+            while time.monotonic() < stop:
+                rows = [_row(random.choice(CODES), random.choice(DAYS))]
+                try:
+                    if writer:
+                        writer.run(lambda s: bulk_upsert_stocks(s, rows))
+                    else:
+                        bulk_upsert_stocks(db, rows)
+                        db.commit()
+                    bump("writes")
+                except Exception:
+                    db.rollback()
+                    bump("errors")
+
+    threads = [threading.Thread(target=read_loop) for _ in range(readers)]
+    threads += [threading.Thread(target=write_loop) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    return {k: round(v / seconds, 1) for k, v in counts.items()}
+
+
+def main():
+    before = run(tuned=False)
+    print(f"before (기본 저널 + 개별 커밋): reads/s={before['reads']} writes/s={before['writes']} errors/s={before['errors']}")
+    after = run(tuned=True)
+    print(f"after  (WAL + 단일 writer):     reads/s={after['reads']} writes/s={after['writes']} errors/s={after['errors']}")
+
+
+if __name__ == "__main__":
+    main()
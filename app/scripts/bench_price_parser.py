@@ -0,0 +1,60 @@
+import random
+import time
+from datetime import date, timedelta
+from io import StringIO
+import pandas as pd
+from app.services.price_parser import parse_krx_price_csv
+
+HEADER = "일자,종가,대비,등락률,시가,고가,저가,거래량,거래대금,시가총액,상장주식수"
+
+
+def make_krx_csv(rows: int = 740) -> bytes:
+    lines = [HEADER]
+    day = date(2025, 6, 30)
+    for _ in range(rows):
+        p = random.randint(1000, 900000)
+        lines.append(
+            f'{day:%Y/%m/%d},"{p:,}",-100,-0.1,"{p:,}","{p + 100:,}","{p - 100:,}",'
+            f'"{random.randint(0, 10**8):,}","{random.randint(0, 10**12):,}","{random.randint(0, 10**15):,}","{10**8:,}"'
+        )
+        day -= timedelta(days=1)
+    return "\n".join(lines).encode("euc-kr")
+
+
+def legacy_parse(content: bytes) -> list[tuple]:
+    # 이전 경로: str 로 디코딩 → 타입 추론 read_csv → 셀마다 콤마 제거
+    text = content.decode("euc-kr")
+    df = pd.read_csv(StringIO(text))
+    return [
+        (
+            pd.to_datetime(row["일자"]),
+            float(str(row["시가"]).replace(",", "") or 0),
+            float(str(row["고가"]).replace(",", "") or 0),
+            float(str(row["저가"]).replace(",", "") or 0),
+            float(str(row["종가"]).replace(",", "") or 0),
+            int(str(row["거래량"]).replace(",", "") or 0),
+            int(str(row["거래대금"]).replace(",", "") or 0),
+            int(str(row["시가총액"]).replace(",", "") or 0),
+        )
+        for _, row in df.iterrows()
+    ]
+
+
+def bench(fn, content: bytes, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(content)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main(rows: int = 740, repeat: int = 20):
+    content = make_krx_csv(rows)
+    legacy = bench(legacy_parse, content, repeat)
+    fast = bench(parse_krx_price_csv, content, repeat)
+    print(f"📄 KRX CSV {rows}행 ({len(content):,} bytes), {repeat}회 평균")
+    print(f" - 기존 경로: {legacy:.2f} ms/file")
+    print(f" - price_parser: {fast:.2f} ms/file ({legacy / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,26 @@
-import requests
 import pandas as pd
+from app.services import http_cache
+
+ISIN_URL = "https://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
+
+
+def _parse_isin_listing(res) -> pd.DataFrame:
+    try:
+        data = res.json().get("OutBlock_1", [])
+    except Exception:
+        print("응답 내용:", res.text()[:500])
+        raise
+
+    df = pd.DataFrame(data)
+    df = df.rename(columns={
+        "ISU_SRT_CD": "종목코드",
+        "ISU_ABBRV": "종목명",
+        "ISU_CD": "ISIN코드"
+    })
+    return df[["종목코드", "종목명", "ISIN코드"]]
 
 
 def get_isin_mapping() -> pd.DataFrame:
-    url = "https://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
     payload = {
         "bld": "dbms/MDC/STAT/standard/MDCSTAT01901",
         "mktId": "ALL"
@@ -15,19 +32,11 @@ def get_isin_mapping() -> pd.DataFrame:
         "Referer": "https://data.krx.co.kr/contents/MDC/MDI/mdiLoader"
     }
 
-    res = requests.post(url, data=payload, headers=headers)
-    
     try:
-        data = res.json().get("OutBlock_1", [])
-    except Exception as e:
+        return http_cache.fetch_frame(
+            ISIN_URL, _parse_isin_listing, name="isin_listing",
+            method="POST", data=payload, headers=headers,
+        )
+    except ValueError as e:
         print("❌ JSON 파싱 실패:", e)
-        print("응답 내용:", res.text[:500])  
-        return pd.DataFrame()
-
-    df = pd.DataFrame(data)
-    df = df.rename(columns={
-        "ISU_SRT_CD": "종목코드",
-        "ISU_ABBRV": "종목명",
-        "ISU_CD": "ISIN코드"
-    })
-    return df[["종목코드", "종목명", "ISIN코드"]]
\ No newline at end of file
+        return pd.DataFrame(columns=["종목코드", "종목명", "ISIN코드"])
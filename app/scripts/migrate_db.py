@@ -0,0 +1,39 @@
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from app.crud.sector_crud import refresh_sector_daily
+from app.database import engine
+from app.models.models import Base, SectorDaily, Stock
+
+
+def dedupe_stocks(conn) -> int:
+    # 같은 (stock_code, trade_date) 중 가장 최근에 저장된 행만 남김
+    result = conn.execute(text("""
+        DELETE FROM stocks
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM stocks GROUP BY stock_code, trade_date
+        )
+    """))
+    return result.rowcount
+
+
+def migrate():
+    with engine.begin() as conn:
+        removed = dedupe_stocks(conn)
+        # 신규 테이블/인덱스만 생성 (기존 테이블은 유지)
+        Base.metadata.create_all(bind=conn)
+        for index in Base.metadata.tables["stocks"].indexes:
+            index.create(bind=conn, checkfirst=True)
+        # (stock_code, trade_date) 복합 인덱스의 접두사와 겹치는 인덱스 제거
+        conn.execute(text("DROP INDEX IF EXISTS ix_stocks_stock_code"))
+
+    with Session(engine) as db:
+        # 섹터 집계가 비어 있으면 저장된 전체 날짜로 한 번 채움
+        if db.scalar(select(SectorDaily.id).limit(1)) is None:
+            refresh_sector_daily(db, list(db.scalars(select(Stock.trade_date.distinct()))))
+            db.commit()
+
+    print(f"✅ 마이그레이션 완료: 중복 시세 {removed}행 삭제")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -1,45 +1,41 @@
+import time
 import pandas as pd
-import requests
-from io import StringIO
-from app.database import SessionLocal
-from app.models.models import Company, Sector
+from sqlalchemy import insert
+from app.database import db_writer
+from app.models.models import Company
+from app.scripts.save_sectors import ensure_sectors, fetch_corp_list
 
 
 def fetch_krx_companies():
-    url = "https://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13"
-
-    res = requests.get(url)
-    res.encoding = "euc-kr" 
-  
-    df = pd.read_html(StringIO(res.text), header=0)[0]
+    df = fetch_corp_list()
     df = df[['회사명', '종목코드', '업종', '주요제품']].dropna(subset=['업종'])
     df['종목코드'] = df['종목코드'].apply(lambda x: str(x).zfill(6))
     return df
 
 
 def save_companies_to_db(df):
-    db = SessionLocal()
-    for _, row in df.iterrows():
-        # 섹터가 이미 존재하는지 확인
-        sector = db.query(Sector).filter_by(sector_name=row['업종']).first()
-        if not sector:
-            sector = Sector(sector_name=row['업종'])
-            db.add(sector)
-            db.commit()
-            db.refresh(sector)
-
-        # 회사 등록
-        exists = db.query(Company).filter_by(company_code=row['종목코드']).first()
-        if not exists:
-            company = Company(
-                company_name=row['회사명'],
-                company_code=row['종목코드'],
-                sector_id=sector.id,
-                product_description=row['주요제품']
-            )
-            db.add(company)
-    db.commit()
-    db.close()
+    def sync(db) -> int:
+        # 업종/기존 종목코드를 미리 읽어 두고 차이만 한 번에 insert
+        sector_ids = ensure_sectors(db, df['업종'].tolist())
+        existing_codes = {code for (code,) in db.query(Company.company_code)}
+
+        new_df = df[~df['종목코드'].isin(existing_codes)].drop_duplicates(subset=['종목코드'])
+        rows = [
+            {
+                "company_name": row['회사명'],
+                "company_code": row['종목코드'],
+                "sector_id": sector_ids[row['업종']],
+                "product_description": None if pd.isna(row['주요제품']) else row['주요제품'],
+            }
+            for row in new_df.to_dict("records")
+        ]
+        if rows:
+            db.execute(insert(Company), rows)
+        return len(rows)
+
+    started = time.perf_counter()
+    inserted = db_writer.run(sync)
+    print(f"⏱️ 신규 회사 {inserted}개 / DB {time.perf_counter() - started:.3f}s")
 
 
 def main():
@@ -49,4 +45,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,29 +1,40 @@
 import pandas as pd
-import requests
 from io import StringIO
-from app.database import SessionLocal
+from sqlalchemy import insert
+from app.database import db_writer
 from app.models.models import Sector
+from app.services import http_cache
 
+CORP_LIST_URL = "https://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13"
 
-def fetch_krx_sectors():
-    url = "https://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13"
 
-    res = requests.get(url)
-    res.encoding = "euc-kr" 
-  
-    df = pd.read_html(StringIO(res.text), header=0)[0]
+def _parse_corp_list(res) -> pd.DataFrame:
+    return pd.read_html(StringIO(res.text("euc-kr")), header=0)[0]
+
+
+def fetch_corp_list() -> pd.DataFrame:
+    # 업종/회사 저장이 같은 상장법인 목록을 쓰므로 하루 한 번만 받고 파싱 결과도 캐시
+    return http_cache.fetch_frame(CORP_LIST_URL, _parse_corp_list, name="corp_list")
+
+
+def fetch_krx_sectors():
+    df = fetch_corp_list()
     sector_names = df['업종'].dropna().unique().tolist()
     return sector_names
 
 
+def ensure_sectors(db, sector_names) -> dict[str, int]:
+    """없는 업종만 한 번에 추가하고 {업종명: id} 반환"""
+    sector_ids = dict(db.query(Sector.sector_name, Sector.id))
+    new_names = [name for name in dict.fromkeys(sector_names) if name not in sector_ids]
+    if new_names:
+        db.execute(insert(Sector), [{"sector_name": name} for name in new_names])
+        sector_ids.update(db.query(Sector.sector_name, Sector.id).filter(Sector.sector_name.in_(new_names)))
+    return sector_ids
+
+
 def save_sectors_to_db(sector_names):
-    db = SessionLocal()
-    for name in sector_names:
-        exists = db.query(Sector).filter_by(sector_name=name).first()
-        if not exists:
-            db.add(Sector(sector_name=name))
-    db.commit()
-    db.close()
+    db_writer.run(lambda db: ensure_sectors(db, sector_names))
 
 
 def main():
@@ -1,23 +1,31 @@
-from app.database import SessionLocal
+from sqlalchemy import or_, update
+from app.database import db_writer
 from app.models.models import Company
 from app.scripts.isin_mapper import get_isin_mapping
 
 
 def update_isin_codes():
     isin_df = get_isin_mapping()
-    db = SessionLocal()
 
-    updated = 0
-    for _, row in isin_df.iterrows():
-        company = db.query(Company).filter_by(company_code=row["종목코드"]).first()
-        if company and not company.isin_code:
-            company.isin_code = row["ISIN코드"]
-            updated += 1
+    def apply(db) -> int:
+        # ISIN 이 비어 있는 회사만 {종목코드: id} 로 읽어 와서 매핑되는 것만 일괄 update
+        missing = dict(
+            db.query(Company.company_code, Company.id)
+            .filter(or_(Company.isin_code.is_(None), Company.isin_code == ""))
+        )
+        isin_by_code = dict(zip(isin_df["종목코드"], isin_df["ISIN코드"]))
+        rows = [
+            {"id": company_id, "isin_code": isin_by_code[code]}
+            for code, company_id in missing.items()
+            if isin_by_code.get(code)
+        ]
+        if rows:
+            db.execute(update(Company), rows)
+        return len(rows)
 
-    db.commit()
-    db.close()
+    updated = db_writer.run(apply)
     print(f"✅ ISIN 코드 {updated}개 회사에 업데이트 완료")
 
 
 if __name__ == "__main__":
-    update_isin_codes()
\ No newline at end of file
+    update_isin_codes()
@@ -1,5 +1,9 @@
 from app.crud.company_crud import set_liked_companies
+from app.services.watchlist_service import invalidate_liked
 
 
 def update_liked_status(company_names: list[str]) -> dict:
-    return set_liked_companies(company_names)
+    result = set_liked_companies(company_names)
+    if result["updated"]:
+        invalidate_liked()
+    return result
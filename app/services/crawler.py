@@ -1,51 +1,123 @@
+import asyncio
 import os
+from datetime import date
+import httpx
 import pandas as pd
-import requests
-import time
-from io import StringIO
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from app.crud.stock_crud import build_stock_rows, bulk_upsert_stocks, get_latest_trade_dates, mark_derived_pending
+from app.database import SessionLocal, db_writer
+from app.models.models import Company
+from app.services.price_parser import parse_naver_price_page
+from app.services.stock_service import flush_derived
 
+NAVER_PRICE_URL = os.getenv("NAVER_PRICE_URL", "https://finance.naver.com/item/sise_day.nhn")
 SAVE_DIR = "selected/selected_stocks"
-os.makedirs(SAVE_DIR, exist_ok=True)
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_PAGES = 100
 
-def get_price_df(args):
-    code, name, sector, max_pages = args
+
+async def get_price_df(client: httpx.AsyncClient, code: str, latest: date | None = None, max_pages: int = DEFAULT_MAX_PAGES) -> pd.DataFrame:
+    """최근 페이지부터 읽다가 이미 저장된 날짜(latest)에 닿으면 바로 멈춤"""
     dfs = []
     seen_dates = set()
     for page in range(1, max_pages + 1):
-        url = f"https://finance.naver.com/item/sise_day.nhn?code={code}&page={page}"
-        res = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-        res.encoding = 'euc-kr'
+        res = await client.get(NAVER_PRICE_URL, params={"code": code, "page": page})
+        res.raise_for_status()
         try:
-            df = pd.read_html(StringIO(res.text), header=0)[0]
+            df = parse_naver_price_page(res.content.decode("euc-kr", errors="replace"))
         except ValueError:
             break
-        df = df.dropna()
         if df.empty: break
-        if page_dates := set(df['날짜'].dropna()):
-            if page_dates & seen_dates: break
-            seen_dates.update(page_dates)
-        df['code'], df['name'], df['codeSector'] = code, name, sector
-        df = df[['날짜', 'codeSector', 'code', 'name', '종가', '시가', '고가', '저가', '거래량']]
-        df.columns = ['date', 'codeSector', 'code', 'name', 'close', 'open', 'high', 'low', 'volume']
-        df = df.sort_values('date')
-        dfs.append(df)
-        time.sleep(0.1)
-    return pd.concat(dfs) if dfs else pd.DataFrame()
-
-def fetch_stocks_from_db(db, max_pages=100):
-    stocks = db.query(Stock).all()
-    args_list = [(s.code, s.name, s.sector, max_pages) for s in stocks]
-    results = []
-    with ProcessPoolExecutor(max_workers=8) as executor:
-        futures = [executor.submit(get_price_df, args) for args in args_list]
-        for future in as_completed(futures):
-            df = future.result()
-            if not df.empty:
-                results.append(df)
-    if results:
-        final = pd.concat(results, ignore_index=True)
-        file_path = os.path.join(SAVE_DIR, "collected_prices.csv")
-        final.to_csv(file_path, index=False, encoding="utf-8-sig")
-        return file_path
-    return None
+        # 마지막 페이지를 넘기면 네이버가 같은 페이지를 다시 돌려줌
+        page_dates = set(df["trade_date"])
+        if page_dates & seen_dates: break
+        seen_dates.update(page_dates)
+
+        if latest is not None:
+            reached = df["trade_date"].dt.date <= latest
+            df = df[~reached]
+            dfs.append(df)
+            if reached.any(): break
+        else:
+            dfs.append(df)
+    return pd.concat(dfs).sort_values("trade_date") if dfs else pd.DataFrame()
+
+
+def save_to_db(company: Company, df: pd.DataFrame) -> int:
+    rows = build_stock_rows(company, df)
+
+    def write(session):
+        saved = bulk_upsert_stocks(session, rows)
+        if rows:
+            mark_derived_pending(session, {company.company_code: min(row["trade_date"] for row in rows)})
+        return saved
+
+    # 파생 데이터는 여기서 갱신하지 않음 — 종목마다 하면 섹터 집계 등이 쓰기 스레드에 수천 번 쌓임
+    return db_writer.run(write)
+
+
+def _file_path(code: str, save_dir: str = SAVE_DIR) -> str:
+    return os.path.join(save_dir, f"{code}.csv")
+
+
+def get_latest_file_dates(codes: list[str], save_dir: str = SAVE_DIR) -> dict[str, date]:
+    latest = {}
+    for code in codes:
+        if os.path.exists(_file_path(code, save_dir)):
+            dates = pd.read_csv(_file_path(code, save_dir), usecols=["trade_date"])["trade_date"]
+            if not dates.empty:
+                latest[code] = pd.to_datetime(dates).max().date()
+    return latest
+
+
+def save_to_file(company: Company, df: pd.DataFrame, save_dir: str = SAVE_DIR) -> int:
+    os.makedirs(save_dir, exist_ok=True)
+    file_path = _file_path(company.company_code, save_dir)
+    df.assign(stock_code=company.company_code, stock_name=company.company_name).to_csv(
+        file_path, mode="a", index=False, header=not os.path.exists(file_path), encoding="utf-8-sig"
+    )
+    return len(df)
+
+
+async def crawl_companies(companies: list[Company], latest: dict[str, date], sink, concurrency: int = DEFAULT_CONCURRENCY, max_pages: int = DEFAULT_MAX_PAGES) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    summary = {"success": 0, "fail": 0, "rows": 0}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers={"User-Agent": "Mozilla/5.0"}, limits=limits, timeout=30) as client:
+        async def crawl_one(company: Company):
+            async with semaphore:
+                try:
+                    df = await get_price_df(client, company.company_code, latest.get(company.company_code), max_pages)
+                    # 종목마다 바로 내보내고 버려서 전체 종목 수와 무관하게 메모리 일정
+                    saved = await asyncio.to_thread(sink, company, df) if not df.empty else 0
+                    summary["success"] += 1
+                    summary["rows"] += saved
+                except Exception as e:
+                    print(f"❌ 오류 발생 ({company.company_code}): {e}")
+                    summary["fail"] += 1
+
+        await asyncio.gather(*(crawl_one(company) for company in companies))
+    return summary
+
+
+def fetch_stocks_from_db(codes: list[str] | None = None, to_db: bool = True, max_pages: int = DEFAULT_MAX_PAGES, concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+    """companies 테이블 기준으로 네이버 일별 시세를 이어받기 (codes 가 없으면 전체 종목)"""
+    with SessionLocal() as db:
+        query = db.query(Company).filter(Company.company_code.isnot(None))
+        if codes:
+            query = query.filter(Company.company_code.in_(codes))
+        companies = query.all()
+        stock_codes = [c.company_code for c in companies]
+        latest = get_latest_trade_dates(db, stock_codes) if to_db else get_latest_file_dates(stock_codes)
+        db.expunge_all()
+
+    sink = save_to_db if to_db else save_to_file
+    try:
+        summary = asyncio.run(crawl_companies(companies, latest, sink, concurrency, max_pages))
+    finally:
+        if to_db:
+            # 저장된 종목(derived_pending)의 파생 데이터를 수집이 끝난 뒤(중간에 실패해도) 한 번에 갱신
+            with SessionLocal() as db:
+                flush_derived(db, stock_codes)
+    print(f"\n📊 완료: 성공={summary['success']}, 실패={summary['fail']}, 저장={summary['rows']}행")
+    return summary
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+import requests
+
+# KRX 기준정보처럼 하루에 한 번이면 충분한 다운로드용 디스크 캐시
+CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "data/http_cache")
+# normal: TTL 안이면 캐시, 지나면 조건부 요청 / record: 항상 받아서 저장 / replay: 네트워크 없이 저장본만
+CACHE_MODE = os.getenv("HTTP_CACHE_MODE", "normal")
+DEFAULT_TTL = 24 * 60 * 60
+
+
+class CacheMiss(LookupError):
+    pass
+
+
+class CachedResponse:
+    def __init__(self, content: bytes, meta: dict, from_cache: bool):
+        self.content = content
+        self.meta = meta
+        self.from_cache = from_cache
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.content.decode(encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _key(method: str, url: str, data: dict | None) -> str:
+    raw = json.dumps([method.upper(), url, sorted((data or {}).items())], ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _paths(key: str, cache_dir: str) -> tuple[str, str]:
+    return os.path.join(cache_dir, f"{key}.body"), os.path.join(cache_dir, f"{key}.json")
+
+
+def _atomic_write(path: str, content: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _load(key: str, cache_dir: str):
+    body_path, meta_path = _paths(key, cache_dir)
+    if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+        return None, None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    with open(body_path, "rb") as f:
+        return f.read(), meta
+
+
+def _store(key: str, cache_dir: str, content: bytes, meta: dict):
+    os.makedirs(cache_dir, exist_ok=True)
+    body_path, meta_path = _paths(key, cache_dir)
+    _atomic_write(body_path, content)
+    _atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+
+def fetch(
+    url: str,
+    method: str = "GET",
+    data: dict | None = None,
+    headers: dict | None = None,
+    ttl: int = DEFAULT_TTL,
+    session=None,
+    mode: str | None = None,
+    cache_dir: str = CACHE_DIR,
+) -> CachedResponse:
+    mode = mode or CACHE_MODE
+    key = _key(method, url, data)
+    content, meta = _load(key, cache_dir)
+
+    if mode == "replay":
+        if content is None:
+            raise CacheMiss(f"캐시에 없는 요청: {method} {url}")
+        return CachedResponse(content, meta, True)
+
+    if mode != "record" and content is not None and time.time() - meta["fetched_at"] < ttl:
+        return CachedResponse(content, meta, True)
+
+    request_headers = dict(headers or {})
+    if mode != "record" and content is not None:
+        # 서버가 지원하면 304 로 본문 재전송 생략
+        if meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+
+    res = (session or requests).request(method, url, data=data, headers=request_headers)
+    if res.status_code == 304 and content is not None:
+        meta["fetched_at"] = time.time()
+        _store(key, cache_dir, content, meta)
+        return CachedResponse(content, meta, True)
+    res.raise_for_status()
+
+    meta = {
+        "url": url,
+        "method": method.upper(),
+        "fetched_at": time.time(),
+        "etag": res.headers.get("ETag"),
+        "last_modified": res.headers.get("Last-Modified"),
+        "sha1": hashlib.sha1(res.content).hexdigest(),
+    }
+    _store(key, cache_dir, res.content, meta)
+    return CachedResponse(res.content, meta, False)
+
+
+def fetch_frame(url: str, parse, name: str, cache_dir: str = CACHE_DIR, **kwargs):
+    """fetch() 결과를 parse(CachedResponse) 로 만든 DataFrame 까지 캐시 — 본문이 같으면 다시 파싱하지 않음"""
+    res = fetch(url, cache_dir=cache_dir, **kwargs)
+    key = _key(kwargs.get("method", "GET"), url, kwargs.get("data"))
+    frame_path = os.path.join(cache_dir, f"{key}.{name}.pkl")
+
+    if os.path.exists(frame_path):
+        with open(frame_path, "rb") as f:
+            sha1, frame = pickle.load(f)
+        if sha1 == res.meta["sha1"]:
+            return frame.copy()
+
+    try:
+        frame = parse(res)
+    except Exception:
+        # 파싱할 수 없는 응답(오류 페이지 등)은 캐시에 남기지 않음
+        for path in _paths(key, cache_dir):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    os.makedirs(cache_dir, exist_ok=True)
+    _atomic_write(frame_path, pickle.dumps((res.meta["sha1"], frame)))
+    return frame.copy()
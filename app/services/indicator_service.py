@@ -0,0 +1,180 @@
+import time
+from datetime import date
+import numpy as np
+import pandas as pd
+from app.crud.indicator_crud import upsert_indicators, upsert_indicator_states
+from app.database import db_writer
+from app.models.models import IndicatorState
+from app.services.price_store import load_price_series
+
+EMA_FAST, EMA_SLOW, MACD_SIGNAL = 12, 26, 9
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+BB_PERIOD, BB_WIDTH = 20, 2.0
+VOLUME_MA = 20
+SMA_PERIODS = (5, 20, 60)
+EMA_BLOCK = 256
+
+STATE_FIELDS = ("prev_close", "ema_12", "ema_26", "macd_signal", "avg_gain", "avg_loss", "atr")
+
+
+def _ema(x: np.ndarray, alpha: float, seed: float | None = None) -> np.ndarray:
+    """y_t = (1-a)·y_{t-1} + a·x_t 를 블록 단위 누적합으로 계산 (seed 가 없으면 첫 값에서 시작)"""
+    out = np.empty(len(x))
+    if not len(x):
+        return out
+    prev = x[0] if seed is None else seed
+    beta = 1.0 - alpha
+    for lo in range(0, len(x), EMA_BLOCK):
+        block = x[lo:lo + EMA_BLOCK]
+        # 블록을 짧게 잘라 beta^-k 가 넘치지 않게 함
+        decay = beta ** np.arange(1, len(block) + 1)
+        out[lo:lo + len(block)] = decay * (prev + alpha * np.cumsum(block / decay))
+        prev = out[lo + len(block) - 1]
+    return out
+
+
+def _rolling(x: np.ndarray, n: int, start: int) -> tuple[np.ndarray, np.ndarray]:
+    """위치 start 이후 각 봉의 n 구간 평균/분산 (구간이 모자라면 NaN)"""
+    lo = max(0, start - n + 1)
+    seg = x[lo:]
+    s1 = np.concatenate(([0.0], np.cumsum(seg)))
+    s2 = np.concatenate(([0.0], np.cumsum(seg * seg)))
+    pos = np.arange(start, len(x))
+    mean = np.full(len(pos), np.nan)
+    var = np.full(len(pos), np.nan)
+    ok = pos >= n - 1
+    end = pos[ok] - lo + 1
+    mean[ok] = (s1[end] - s1[end - n]) / n
+    var[ok] = np.maximum((s2[end] - s2[end - n]) / n - mean[ok] ** 2, 0.0)
+    return mean, var
+
+
+def _warmup(values: np.ndarray, bar_index: np.ndarray, first_valid: int) -> np.ndarray:
+    return np.where(bar_index >= first_valid, values, np.nan)
+
+
+def compute_indicators(close, high, low, volume, start: int = 0, state: dict | None = None) -> tuple[dict, dict]:
+    """봉 start 부터의 지표와 마지막 봉 기준 상태 반환
+
+    state 가 있으면 start-1 번째 봉까지의 EMA/RSI/ATR 누적값을 이어서 계산 (start 이전 봉은 이동평균 구간에만 사용)
+    """
+    n = len(close)
+    c = close[start:]
+    bar_index = np.arange(start, n)
+    prev_close = np.concatenate(([state["prev_close"] if state else np.nan], c[:-1]))
+    seed = state or {}
+
+    out = {}
+    for period in SMA_PERIODS:
+        out[f"sma_{period}"], _ = _rolling(close, period, start)
+    mean, var = _rolling(close, BB_PERIOD, start)
+    out["bb_middle"] = mean
+    out["bb_upper"] = mean + BB_WIDTH * np.sqrt(var)
+    out["bb_lower"] = mean - BB_WIDTH * np.sqrt(var)
+    out["volume_ma_20"], _ = _rolling(volume, VOLUME_MA, start)
+
+    ema_fast = _ema(c, 2 / (EMA_FAST + 1), seed.get("ema_12"))
+    ema_slow = _ema(c, 2 / (EMA_SLOW + 1), seed.get("ema_26"))
+    macd = ema_fast - ema_slow
+    signal = _ema(macd, 2 / (MACD_SIGNAL + 1), seed.get("macd_signal"))
+    out["ema_12"] = _warmup(ema_fast, bar_index, EMA_FAST - 1)
+    out["ema_26"] = _warmup(ema_slow, bar_index, EMA_SLOW - 1)
+    out["macd"] = _warmup(macd, bar_index, EMA_SLOW - 1)
+    out["macd_signal"] = _warmup(signal, bar_index, EMA_SLOW + MACD_SIGNAL - 2)
+    out["macd_hist"] = out["macd"] - out["macd_signal"]
+
+    # RSI (Wilder) — 전체 계산이면 첫 봉은 전일 종가가 없으므로 둘째 봉부터
+    skip = 0 if state else 1
+    delta = (c - prev_close)[skip:]
+    avg_gain = _ema(np.clip(delta, 0, None), 1 / RSI_PERIOD, seed.get("avg_gain"))
+    avg_loss = _ema(np.clip(-delta, 0, None), 1 / RSI_PERIOD, seed.get("avg_loss"))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    out["rsi_14"] = _warmup(np.concatenate(([np.nan] * skip, rsi)), bar_index, RSI_PERIOD)
+
+    h, l = high[start:], low[start:]
+    true_range = np.fmax(h - l, np.fmax(np.abs(h - prev_close), np.abs(l - prev_close)))
+    atr = _ema(true_range, 1 / ATR_PERIOD, seed.get("atr"))
+    out["atr_14"] = _warmup(atr, bar_index, ATR_PERIOD - 1)
+
+    new_state = {
+        "prev_close": float(c[-1]),
+        "ema_12": float(ema_fast[-1]),
+        "ema_26": float(ema_slow[-1]),
+        "macd_signal": float(signal[-1]),
+        "avg_gain": float(avg_gain[-1]) if len(avg_gain) else None,
+        "avg_loss": float(avg_loss[-1]) if len(avg_loss) else None,
+        "atr": float(atr[-1]),
+    }
+    return out, new_state
+
+
+def _resume_index(state: IndicatorState | None, dates: np.ndarray, since: date | None) -> int:
+    # 저장된 상태가 지금 시세와 이어지고, 새로 들어온 봉이 모두 그 뒤일 때만 증분 계산
+    if state is None or state.avg_gain is None:
+        return 0
+    if since is not None and since <= state.last_date:
+        return 0
+    if state.bars > len(dates) or dates[state.bars - 1] != np.datetime64(state.last_date, "D"):
+        return 0
+    return state.bars
+
+
+def update_indicators(db, since_by_code: dict[str, date | None]) -> int:
+    """
+    컬럼 저장소의 시세로 종목별 지표를 갱신
+
+    - since_by_code: 종목코드 → 그 종목에 새로 들어온 첫 거래일 (None 이면 전체 재계산)
+    - 종목마다 자기 since 로 이어서 계산할 수 있는지 판단 (이을 수 없으면 그 종목만 전체 재계산)
+    """
+    started = time.perf_counter()
+    stock_codes = sorted(since_by_code)
+    states = {
+        s.stock_code: s
+        for s in db.query(IndicatorState).filter(IndicatorState.stock_code.in_(stock_codes))
+    }
+
+    frames, state_rows = [], []
+    for code in stock_codes:
+        series = load_price_series(code)
+        if series is None or not len(series):
+            continue
+        dates = series["trade_date"]
+        state = states.get(code)
+        start = _resume_index(state, dates, since_by_code[code])
+        if start >= len(series):
+            continue
+
+        values, new_state = compute_indicators(
+            np.ascontiguousarray(series["closing_price"]),
+            np.ascontiguousarray(series["highest_price"]),
+            np.ascontiguousarray(series["lowest_price"]),
+            np.ascontiguousarray(series["trading_volume"], dtype="float64"),
+            start,
+            {f: getattr(state, f) for f in STATE_FIELDS} if start else None,
+        )
+        frame = pd.DataFrame(values)
+        frame.insert(0, "trade_date", pd.to_datetime(dates[start:]).date)
+        frame.insert(0, "stock_code", code)
+        frames.append(frame)
+        state_rows.append({
+            "stock_code": code,
+            "last_date": frames[-1]["trade_date"].iloc[-1],
+            "bars": len(series),
+            **new_state,
+        })
+
+    if not frames:
+        return 0
+    frame = pd.concat(frames, ignore_index=True)
+    rows = frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+    def save(session):
+        upsert_indicators(session, rows)
+        upsert_indicator_states(session, state_rows)
+
+    db_writer.run(save)
+    elapsed = time.perf_counter() - started
+    print(f"📐 지표 갱신: {len(state_rows)}종목 / {len(rows)}행 / {elapsed:.3f}s")
+    return len(rows)
@@ -0,0 +1,99 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_RUNNING_JOBS = 2
+MAX_KEPT_JOBS = 100
+
+
+class Job:
+    def __init__(self, kind: str, codes: list[str]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.codes = {code: "pending" for code in codes}
+        self.success = 0
+        self.fail = 0
+        self.rows = 0
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def record(self, code: str, ok: bool, rows: int = 0):
+        with self._lock:
+            self.codes[code] = "success" if ok else "fail"
+            if ok:
+                self.success += 1
+                self.rows += rows
+            else:
+                self.fail += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            end = self.finished_at or time.time()
+            elapsed = end - self.started_at if self.started_at else 0.0
+            done = self.success + self.fail
+            return {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "total": len(self.codes),
+                "done": done,
+                "success": self.success,
+                "fail": self.fail,
+                "rows": self.rows,
+                "elapsed_sec": round(elapsed, 3),
+                "codes_per_sec": round(done / elapsed, 2) if elapsed else 0.0,
+                "rows_per_sec": round(self.rows / elapsed, 1) if elapsed else 0.0,
+                "error": self.error,
+                "codes": dict(self.codes),
+            }
+
+
+class JobManager:
+    """작업을 제한된 스레드 풀에서 실행하고 진행 상황을 보관"""
+
+    def __init__(self, max_workers: int = MAX_RUNNING_JOBS, max_kept: int = MAX_KEPT_JOBS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.max_kept = max_kept
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, codes: list[str], fn) -> Job:
+        """fn(job) 을 백그라운드로 실행 — fn 은 job.record() 로 진행 상황을 남김"""
+        job = Job(kind, codes)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+        self.executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: Job, fn):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            fn(job)
+            job.status = "done"
+        except Exception as e:
+            print(f"❌ 작업 실패 ({job.id}): {e}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _evict(self):
+        # 끝난 작업부터 오래된 순으로 정리
+        finished = [jid for jid, j in self._jobs.items() if j.finished_at]
+        for jid in finished[: max(0, len(self._jobs) - self.max_kept)]:
+            del self._jobs[jid]
+
+
+job_manager = JobManager()
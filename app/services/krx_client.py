@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import cloudscraper
+from cloudscraper import CipherSuiteAdapter
+from requests.adapters import HTTPAdapter
+
+# 로컬 대역 서버로 테스트할 때는 KRX_BASE_URL=http://127.0.0.1:8001 처럼 지정
+KRX_BASE_URL = os.getenv("KRX_BASE_URL", "http://data.krx.co.kr")
+OTP_PATH = "/comm/fileDn/GenerateOTP/generate.cmd"
+CSV_PATH = "/comm/fileDn/download_csv/download.cmd"
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_REQUESTS_PER_SEC = 5.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 30
+
+
+class RateLimiter:
+    """호스트별 최소 요청 간격을 보장 (스레드 안전)"""
+
+    def __init__(self, requests_per_sec: float):
+        self.interval = 1.0 / requests_per_sec if requests_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at: dict[str, float] = {}
+
+    def wait(self, host: str):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next_at.get(host, now))
+            self._next_at[host] = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
+class KrxClient:
+    """KRX OTP → CSV 다운로드 클라이언트 (공유 세션 + rate limit + 재시도)"""
+
+    def __init__(
+        self,
+        base_url: str = KRX_BASE_URL,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        requests_per_sec: float = DEFAULT_REQUESTS_PER_SEC,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = RateLimiter(requests_per_sec)
+
+        self.session = cloudscraper.create_scraper()
+        # 워커 수만큼 연결을 재사용하도록 풀 크기를 키운 어댑터를 새로 붙임
+        # https 는 cloudscraper 와 같은 TLS 설정(CipherSuiteAdapter)을 유지
+        pool = {"pool_connections": max_workers, "pool_maxsize": max_workers}
+        self.session.mount("http://", HTTPAdapter(**pool))
+        self.session.mount("https://", CipherSuiteAdapter(
+            cipherSuite=self.session.cipherSuite,
+            ecdhCurve=self.session.ecdhCurve,
+            server_hostname=self.session.server_hostname,
+            source_address=self.session.source_address,
+            ssl_context=self.session.ssl_context,
+            **pool,
+        ))
+
+    def _post(self, path: str, data: dict):
+        url = self.base_url + path
+        host = urlparse(url).netloc
+
+        for attempt in range(self.retries + 1):
+            self.limiter.wait(host)
+            try:
+                res = self.session.post(url, data=data, timeout=self.timeout)
+                res.raise_for_status()
+                return res
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def download_csv(self, params: dict):
+        otp_payload = {
+            "locale": "ko_KR",
+            "share": "1",
+            "csvxls_isNo": "false",
+            "name": "fileDown",
+            **params,
+        }
+        otp_code = self._post(OTP_PATH, otp_payload).text
+        res = self._post(CSV_PATH, {"code": otp_code})
+        res.encoding = "EUC-KR"
+        return res
+
+    def fetch_price_history(self, isin_code: str, start_date: str, end_date: str):
+        return self.download_csv({
+            "url": "dbms/MDC/STAT/standard/MDCSTAT01701",
+            "strtDd": start_date,
+            "endDd": end_date,
+            "adjStkPrc": 2,
+            "adjStkPrc_check": "Y",
+            "isuCd": isin_code,
+        })
+
+    def fetch_market_snapshot(self, trade_date: str):
+        # 전종목 시세 (하루치 전체 시장을 한 번에)
+        return self.download_csv({
+            "url": "dbms/MDC/STAT/standard/MDCSTAT01501",
+            "mktId": "ALL",
+            "trdDd": trade_date,
+            "money": 1,
+        })
+
+    def fetch_many(self, fn, items):
+        """items 각각에 fn(item)을 병렬 실행하고 완료 순서대로 (item, result, error) 반환
+
+        다운로드만 워커 스레드에서 겹치고, 결과 소비(DB 저장)는 호출한 스레드에서 순차 처리
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(fn, item): item for item in items}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    yield item, future.result(), None
+                except Exception as e:
+                    yield item, None, e
@@ -0,0 +1,87 @@
+from io import BytesIO, StringIO
+import pandas as pd
+
+# KRX / 네이버 시세를 모두 이 컬럼 구성으로 맞춤 (stocks 테이블 컬럼명과 동일)
+PRICE_COLUMNS = [
+    "trade_date",
+    "opening_price",
+    "highest_price",
+    "lowest_price",
+    "closing_price",
+    "trading_volume",
+    "trade_value",
+    "market_cap",
+]
+FLOAT_COLUMNS = ["opening_price", "highest_price", "lowest_price", "closing_price"]
+INT_COLUMNS = ["trading_volume", "trade_value", "market_cap"]
+
+KRX_ENCODING = "euc-kr"
+KRX_NA_VALUES = ["", "-"]
+KRX_COLUMNS = {
+    "일자": "trade_date",
+    "종목코드": "stock_code",
+    "표준코드": "isin_code",
+    "시가": "opening_price",
+    "고가": "highest_price",
+    "저가": "lowest_price",
+    "종가": "closing_price",
+    "거래량": "trading_volume",
+    "거래대금": "trade_value",
+    "시가총액": "market_cap",
+}
+NAVER_COLUMNS = {
+    "날짜": "trade_date",
+    "시가": "opening_price",
+    "고가": "highest_price",
+    "저가": "lowest_price",
+    "종가": "closing_price",
+    "거래량": "trading_volume",
+}
+
+
+def _canonical(df: pd.DataFrame, date_format: str | None) -> pd.DataFrame:
+    out = pd.DataFrame(index=df.index)
+    if "stock_code" in df.columns:
+        out["stock_code"] = df["stock_code"].astype(str).str.zfill(6)
+    if "isin_code" in df.columns:
+        out["isin_code"] = df["isin_code"]
+    if "trade_date" in df.columns:
+        out["trade_date"] = pd.to_datetime(df["trade_date"], format=date_format)
+    for col in FLOAT_COLUMNS:
+        out[col] = df[col].fillna(0).astype("float64") if col in df.columns else float("nan")
+    for col in INT_COLUMNS:
+        # 없는 컬럼(네이버의 거래대금/시가총액)은 NA 로 두어 저장 시 기존 값을 덮지 않게 함
+        out[col] = df[col].fillna(0).astype("int64") if col in df.columns else pd.array([pd.NA] * len(df), dtype="Int64")
+    return out
+
+
+def _read_krx_csv(content: bytes) -> pd.DataFrame:
+    if not content.strip():
+        return pd.DataFrame(columns=list(KRX_COLUMNS.values()))
+    return pd.read_csv(
+        BytesIO(content),
+        encoding=KRX_ENCODING,
+        thousands=",",
+        na_values=KRX_NA_VALUES,
+        keep_default_na=False,
+        usecols=lambda c: c in KRX_COLUMNS,
+        dtype={"종목코드": str, "표준코드": str, "일자": str, **{k: "float64" for k, v in KRX_COLUMNS.items() if v in FLOAT_COLUMNS + INT_COLUMNS}},
+    ).rename(columns=KRX_COLUMNS)
+
+
+def parse_krx_price_csv(content: bytes) -> pd.DataFrame:
+    """KRX 개별종목 시세 CSV (응답 bytes 그대로) → 표준 컬럼"""
+    return _canonical(_read_krx_csv(content), "%Y/%m/%d")
+
+
+def parse_krx_market_csv(content: bytes) -> pd.DataFrame:
+    """KRX 전종목 시세 CSV (하루치, 날짜 컬럼 없음) → stock_code + 표준 컬럼"""
+    return _canonical(_read_krx_csv(content), None)
+
+
+def parse_naver_price_page(html: str) -> pd.DataFrame:
+    """네이버 일별 시세 페이지 → 표준 컬럼 (거래대금/시가총액은 NA)"""
+    df = pd.read_html(StringIO(html), header=0, thousands=",")[0]
+    df = df.dropna(subset=["날짜"]).rename(columns=NAVER_COLUMNS)
+    df = df[list(NAVER_COLUMNS.values())].dropna()
+    return _canonical(df, "%Y.%m.%d")
@@ -0,0 +1,80 @@
+import os
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.models import Stock
+
+# 종목별 시세를 컬럼형 구조체 배열(.npy) 하나로 저장 → np.load(mmap_mode="r") 로 복사 없이 읽음
+STORE_DIR = os.getenv("PRICE_STORE_DIR", "data/columnar")
+
+PRICE_DTYPE = np.dtype([
+    ("trade_date", "datetime64[D]"),
+    ("opening_price", "f8"),
+    ("highest_price", "f8"),
+    ("lowest_price", "f8"),
+    ("closing_price", "f8"),
+    ("trading_volume", "i8"),
+    ("trade_value", "i8"),
+    ("market_cap", "i8"),
+])
+
+
+def _path(stock_code: str, store_dir: str = STORE_DIR) -> str:
+    return os.path.join(store_dir, f"{stock_code}.npy")
+
+
+def write_price_series(stock_code: str, series: np.ndarray, store_dir: str = STORE_DIR):
+    os.makedirs(store_dir, exist_ok=True)
+    path = _path(stock_code, store_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, series)
+    # 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 교체는 원자적으로
+    os.replace(tmp_path, path)
+
+
+def load_price_series(stock_code: str, store_dir: str = STORE_DIR) -> np.ndarray | None:
+    """종목 전체 시세 (trade_date 오름차순) — series["closing_price"] 등 필드 접근도 복사 없음"""
+    path = _path(stock_code, store_dir)
+    if not os.path.exists(path):
+        return None
+    return np.load(path, mmap_mode="r")
+
+
+def list_stored_codes(store_dir: str = STORE_DIR) -> list[str]:
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(f[:-4] for f in os.listdir(store_dir) if f.endswith(".npy"))
+
+
+def iter_price_series(codes: list[str] | None = None, store_dir: str = STORE_DIR):
+    """전 종목 스캔용 — (종목코드, 시세 배열) 을 차례로 반환"""
+    for code in codes if codes is not None else list_stored_codes(store_dir):
+        series = load_price_series(code, store_dir)
+        if series is not None:
+            yield code, series
+
+
+def sync_price_store(db: Session, stock_codes, store_dir: str = STORE_DIR) -> int:
+    """stocks 테이블 기준으로 주어진 종목들의 컬럼 파일을 다시 만듦"""
+    stock_codes = sorted(set(stock_codes))
+    if not stock_codes:
+        return 0
+
+    table = Stock.__table__
+    stmt = (
+        select(table.c.stock_code, *[table.c[name] for name in PRICE_DTYPE.names])
+        .where(table.c.stock_code.in_(stock_codes))
+        .order_by(table.c.stock_code, table.c.trade_date)
+    )
+    df = pd.DataFrame(db.execute(stmt).all(), columns=["stock_code", *PRICE_DTYPE.names])
+
+    for code, group in df.groupby("stock_code", sort=False):
+        series = np.empty(len(group), dtype=PRICE_DTYPE)
+        series["trade_date"] = pd.to_datetime(group["trade_date"]).to_numpy().astype("datetime64[D]")
+        for name in PRICE_DTYPE.names[1:]:
+            values = group[name].astype("float64")
+            series[name] = values.fillna(0) if PRICE_DTYPE[name].kind == "i" else values
+        write_price_series(code, series, store_dir)
+    return df["stock_code"].nunique()
@@ -1,58 +1,194 @@
-from app.crud.stock_crud import save_stock_records
-from app.database import SessionLocal
+from app.crud.sector_crud import refresh_sector_daily
+from app.crud.stock_crud import (
+    save_stock_records, get_latest_trade_dates, build_market_rows, bulk_upsert_stocks,
+    mark_derived_pending, get_derived_pending, clear_derived_pending, get_trade_dates,
+)
+from app.database import SessionLocal, db_writer
 from app.models.models import Company
-import cloudscraper
-from datetime import datetime, timedelta
-from io import StringIO
-import pandas as pd
+from app.services.krx_client import KrxClient, DEFAULT_MAX_WORKERS
+from app.services.indicator_service import update_indicators
+from app.services.price_store import sync_price_store
+from app.services.watchlist_service import invalidate_quotes
+from app.services.price_parser import parse_krx_price_csv, parse_krx_market_csv
+from datetime import date, datetime, timedelta
+import time
 
+INIT_HISTORY_DAYS = 365 * 3
+# 파생 데이터는 이 종목 수씩 나눠 갱신 — 전 종목 시세/지표를 한 번에 메모리에 올리거나 쓰기 트랜잭션 하나로 묶지 않음
+DERIVED_CHUNK_SIZE = 200
 
-def save_init_stock_price(codes: list[str]) -> dict:
-    scraper = cloudscraper.create_scraper()
-    today = datetime.today()
-    start_date = (today - timedelta(days=365 * 3)).strftime("%Y%m%d")
-    end_date = today.strftime("%Y%m%d")
 
-    db = SessionLocal()
+def last_trading_day(today: date) -> date:
+    # 주말이면 직전 금요일 (공휴일은 KRX가 빈 CSV를 돌려주므로 그대로 둠)
+    while today.weekday() >= 5:
+        today -= timedelta(days=1)
+    return today
+
+
+def after_ingest(db, since_by_code, trade_dates):
+    """시세가 저장된 뒤 파생 데이터(컬럼 저장소 등)를 해당 종목/날짜만 갱신 — since_by_code: 종목코드 → 새로 들어온 첫 거래일"""
+    if not since_by_code:
+        return
+    stock_codes = list(since_by_code)
+    # 쓰기 스레드가 커밋한 내용이 보이도록 읽기 트랜잭션(스냅샷)을 새로 시작
+    db.rollback()
+    sync_price_store(db, stock_codes)
+    invalidate_quotes(stock_codes)
+    # 지표는 종목마다 자기 날짜부터 이어서 계산 (가장 이른 날짜 하나로 묶으면 나머지 종목이 전체 재계산됨)
+    update_indicators(db, since_by_code)
+    db_writer.run(lambda session: refresh_sector_daily(session, trade_dates, stock_codes))
+
+
+def flush_derived(db, stock_codes=None, chunk_size: int = DERIVED_CHUNK_SIZE) -> int:
+    """
+    derived_pending 에 남은 종목의 파생 데이터를 갱신하고 기록을 지움
+
+    - stock_codes 가 없으면 전체 (이전 실행이 중간에 죽어 남은 것까지)
+    - chunk_size 종목씩 갱신하고 그 기록만 지움 (중간에 죽으면 남은 종목은 다음 실행에서 이어서)
+    - 반환: 반영한 종목 수
+    """
+    db.rollback()
+    pending = get_derived_pending(db, stock_codes)
+    codes = sorted(pending)
+    for i in range(0, len(codes), chunk_size):
+        chunk = {code: pending[code] for code in codes[i:i + chunk_size]}
+        since_by_code = {code: since for code, (since, _) in chunk.items()}
+        after_ingest(db, since_by_code, get_trade_dates(db, chunk, min(since_by_code.values())))
+        db_writer.run(lambda session: clear_derived_pending(session, chunk))
+    return len(pending)
+
+
+def _ingest_price_history(db, companies: list[Company], ranges: dict[str, tuple[str, str]], max_workers: int, on_progress=None) -> tuple[int, int]:
+    client = KrxClient(max_workers=max_workers)
     success, fail = 0, 0
+    touched_codes = []
+
+    def download(company: Company):
+        start_date, end_date = ranges[company.isin_code]
+        return client.fetch_price_history(company.isin_code, start_date, end_date)
 
+    # 이전 실행에서 시세만 저장되고 파생 데이터가 빠진 종목이 있으면 먼저 반영
+    flush_derived(db)
+
+    try:
+        for company, res, error in client.fetch_many(download, companies):
+            code = company.isin_code
+            try:
+                if error:
+                    raise error
+                df = parse_krx_price_csv(res.content)
+
+                def write(session):
+                    dates = save_stock_records(session, company, df)
+                    # 파생 데이터 갱신 대상을 시세와 같은 트랜잭션에 기록
+                    if dates:
+                        mark_derived_pending(session, {company.company_code: min(dates)})
+                    return dates
+
+                dates = db_writer.run(write)
+                touched_codes.append(company.company_code)
+                print(f"✅ 저장 완료: {company.company_name} ({code})")
+                success += 1
+                if on_progress:
+                    on_progress(code, True, len(dates))
+
+            except Exception as e:
+                print(f"❌ 오류 발생 ({code}): {e}")
+                db.rollback()
+                fail += 1
+                if on_progress:
+                    on_progress(code, False)
+    finally:
+        # 섹터 집계는 모든 종목에 걸치므로 종목마다가 아니라 끝난 뒤(중간에 실패해도) 한 번에 갱신
+        if touched_codes:
+            flush_derived(db, touched_codes)
+    return success, fail
+
+
+def _load_companies(db, codes: list[str], on_progress=None) -> tuple[list[Company], int]:
+    companies = {
+        c.isin_code: c
+        for c in db.query(Company).filter(Company.isin_code.in_(codes))
+    }
+    # 워커 스레드에서 읽어도 세션을 건드리지 않도록 분리
+    db.expunge_all()
+
+    fail = 0
     for code in codes:
-        company = db.query(Company).filter_by(isin_code=code).first()
-        if not company:
+        if code not in companies:
             print(f"❌ ISIN Code {code}에 해당하는 회사 없음")
             fail += 1
-            continue
+            if on_progress:
+                on_progress(code, False)
+    return [companies[code] for code in dict.fromkeys(codes) if code in companies], fail
 
-        try:
-            otp_url = "http://data.krx.co.kr/comm/fileDn/GenerateOTP/generate.cmd"
-            otp_payload = {
-                'locale': 'ko_KR',
-                "share": '1',
-                "csvxls_isNo": 'false',
-                "name": 'fileDown',
-                "url": 'dbms/MDC/STAT/standard/MDCSTAT01701',
-                'strtDd': start_date,
-                'endDd': end_date,
-                'adjStkPrc': 2,
-                'adjStkPrc_check': 'Y',
-                'isuCd': company.isin_code
-            }
-            otp_code = scraper.post(otp_url, data=otp_payload).text
-
-            csv_url = 'http://data.krx.co.kr/comm/fileDn/download_csv/download.cmd'
-            res = scraper.post(csv_url, data={'code': otp_code})
-            res.encoding = 'EUC-KR'
-            df = pd.read_csv(StringIO(res.text))
-
-            save_stock_records(db, company, df)
-            print(f"✅ 저장 완료: {company.company_name} ({code})")
-            success += 1
-
-        except Exception as e:
-            print(f"❌ 오류 발생 ({code}): {e}")
-            db.rollback()
-            fail += 1
+
+def save_init_stock_price(codes: list[str], max_workers: int = DEFAULT_MAX_WORKERS, on_progress=None) -> dict:
+    today = datetime.today()
+    start_date = (today - timedelta(days=INIT_HISTORY_DAYS)).strftime("%Y%m%d")
+    end_date = today.strftime("%Y%m%d")
+
+    db = SessionLocal()
+    companies, fail = _load_companies(db, codes, on_progress)
+    ranges = {c.isin_code: (start_date, end_date) for c in companies}
+
+    success, download_fail = _ingest_price_history(db, companies, ranges, max_workers, on_progress)
+    fail += download_fail
 
     db.close()
     print(f"\n📊 완료: 성공={success}, 실패={fail}")
-    return {"success": success, "fail": fail}
\ No newline at end of file
+    return {"success": success, "fail": fail}
+
+
+def sync_stock_price(codes: list[str], max_workers: int = DEFAULT_MAX_WORKERS, on_progress=None) -> dict:
+    today = datetime.today().date()
+    target_date = last_trading_day(today)
+    end_date = today.strftime("%Y%m%d")
+
+    db = SessionLocal()
+    companies, fail = _load_companies(db, codes, on_progress)
+    latest = get_latest_trade_dates(db, [c.company_code for c in companies])
+
+    ranges, pending = {}, []
+    for company in companies:
+        last = latest.get(company.company_code)
+        if last and last >= target_date:
+            if on_progress:
+                on_progress(company.isin_code, True, 0)
+            continue
+        start = last + timedelta(days=1) if last else today - timedelta(days=INIT_HISTORY_DAYS)
+        ranges[company.isin_code] = (start.strftime("%Y%m%d"), end_date)
+        pending.append(company)
+
+    skipped = len(companies) - len(pending)
+    print(f"🔄 동기화 대상 {len(pending)}개 / 최신 상태 {skipped}개 건너뜀")
+
+    success, download_fail = _ingest_price_history(db, pending, ranges, max_workers, on_progress)
+    fail += download_fail
+
+    db.close()
+    print(f"\n📊 완료: 성공={success}, 실패={fail}, 건너뜀={skipped}")
+    return {"success": success, "fail": fail, "skipped": skipped}
+
+
+def save_market_snapshot(db, trade_date: date, res) -> list[str]:
+    """하루치 전종목 시세 저장 후 저장된 종목코드 반환 (파생 데이터는 derived_pending 에 기록, 갱신은 호출한 쪽에서 모아서)"""
+    started = time.perf_counter()
+    df = parse_krx_market_csv(res.content)
+    if df.empty:
+        # 휴장일은 빈 CSV
+        return []
+
+    rows = build_market_rows(db, df, trade_date)
+
+    def write(session):
+        saved = bulk_upsert_stocks(session, rows)
+        # 파생 데이터 갱신 대상을 시세와 같은 트랜잭션에 기록
+        mark_derived_pending(session, {row["stock_code"]: trade_date for row in rows})
+        return saved
+
+    saved = db_writer.run(write)
+
+    elapsed = time.perf_counter() - started
+    print(f"⏱️ {trade_date}: {saved}행 / {elapsed:.3f}s ({saved / max(elapsed, 1e-9):,.0f} rows/s)")
+    return [row["stock_code"] for row in rows]
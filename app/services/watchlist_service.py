@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from app.models.models import Company
+from app.services.price_store import load_price_series
+
+WATCHLIST_TTL = float(os.getenv("WATCHLIST_CACHE_TTL", "60"))
+WATCHLIST_MAX_SIZE = int(os.getenv("WATCHLIST_CACHE_SIZE", "1024"))
+YEAR = np.timedelta64(365, "D")
+_MISSING = object()
+
+
+class TTLCache:
+    """만료 시간과 최대 개수가 있는 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl: float = WATCHLIST_TTL, max_size: int = WATCHLIST_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._items.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return default
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, keys=None):
+        with self._lock:
+            if keys is None:
+                self._items.clear()
+                return
+            for key in keys:
+                self._items.pop(key, None)
+
+
+# 관심종목 목록과 종목별 시세 요약을 따로 캐시 — 좋아요가 바뀌면 목록만, 시세가 들어오면 그 종목만 무효화
+LIKED_KEY = ("liked",)
+watchlist_cache = TTLCache()
+
+
+def build_quote(code: str) -> dict | None:
+    """컬럼 저장소의 시세로 최근 종가/전일 대비/거래량/52주 고저 계산"""
+    series = load_price_series(code)
+    if series is None or not len(series):
+        return None
+    last = series[-1]
+    prev_close = float(series[-2]["closing_price"]) if len(series) > 1 else None
+    close = float(last["closing_price"])
+    year = series[series["trade_date"] > last["trade_date"] - YEAR]
+    # 거래정지일은 종가가 0(또는 비어 있음)으로 저장되므로 고저 계산에서 제외
+    traded = year[year["closing_price"] > 0]
+    change = close - prev_close if prev_close is not None else None
+    return {
+        "trade_date": str(last["trade_date"]),
+        "closing_price": close,
+        "change": change,
+        "change_rate": change / prev_close * 100 if prev_close else None,
+        "trading_volume": int(last["trading_volume"]),
+        "high_52w": float(traded["highest_price"].max()) if len(traded) else None,
+        "low_52w": float(traded["lowest_price"].min()) if len(traded) else None,
+    }
+
+
+def _liked_companies(db) -> list[tuple[str, str]]:
+    liked = watchlist_cache.get(LIKED_KEY)
+    if liked is None:
+        liked = [
+            (code, name)
+            for code, name in db.query(Company.company_code, Company.company_name)
+            .filter(Company.is_liked.is_(True), Company.company_code.isnot(None))
+            .order_by(Company.company_name)
+        ]
+        watchlist_cache.set(LIKED_KEY, liked)
+    return liked
+
+
+def get_watchlist(db) -> list[dict]:
+    watchlist = []
+    for code, name in _liked_companies(db):
+        quote = watchlist_cache.get(code, _MISSING)
+        if quote is _MISSING:
+            quote = build_quote(code)
+            watchlist_cache.set(code, quote)
+        watchlist.append({"company_code": code, "company_name": name, "quote": quote})
+    return watchlist
+
+
+def invalidate_quotes(stock_codes):
+    watchlist_cache.invalidate(stock_codes)
+
+
+def invalidate_liked():
+    watchlist_cache.invalidate([LIKED_KEY])
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.price_store import PRICE_DTYPE, write_price_series
+from yeongho import correlation
+
+
+def test_unknown_level_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="level"):
+        correlation.load_news_matrix("company", str(tmp_path))
+    with pytest.raises(ValueError, match="level"):
+        correlation.news_return_correlation("company", data_dir=str(tmp_path), store_dir=str(tmp_path))
+
+
+def _brute_corr(x, y, min_periods):
+    ok = ~np.isnan(y)
+    if ok.sum() < min_periods or x[ok].std() == 0 or y[ok].std() == 0:
+        return np.nan
+    return np.corrcoef(x[ok], y[ok])[0, 1]
+
+
+def _returns_with_gaps(rng, t, m):
+    y = rng.normal(0, 0.02, (t, m))
+    y[:40, 0] = np.nan          # 상장 전
+    y[70:85, 1] = np.nan        # 거래정지
+    y[rng.random(t) < 0.05, 2] = np.nan
+    return y
+
+
+def test_rolling_correlations_skip_missing_returns():
+    rng = np.random.default_rng(0)
+    x = np.log1p(rng.poisson(5, (120, 2)).astype("float64"))
+    y = _returns_with_gaps(rng, 120, 3)
+    window, min_periods = 30, 20
+
+    got = correlation.rolling_correlations(x, y, window, min_periods)
+
+    assert got.shape == (120 - window + 1, 2, 3)
+    for end in range(window, 121):
+        for n in range(2):
+            for m in range(3):
+                expected = _brute_corr(x[end - window:end, n], y[end - window:end, m], min_periods)
+                np.testing.assert_allclose(got[end - window, n, m], expected, rtol=1e-8, atol=1e-12)
+    # 상장 전 구간은 0% 수익률이 아니라 값 없음
+    assert np.isnan(got[0, :, 0]).all()
+
+
+def test_lagged_correlations_skip_missing_returns():
+    rng = np.random.default_rng(1)
+    x = np.log1p(rng.poisson(5, (100, 2)).astype("float64"))
+    y = _returns_with_gaps(rng, 100, 3)
+    max_lag = 3
+    span = 100 - 2 * max_lag
+
+    got = correlation.lagged_correlations(x, y, max_lag, min_periods=20)
+
+    for l in range(2 * max_lag + 1):
+        for n in range(2):
+            for m in range(3):
+                expected = _brute_corr(x[max_lag:max_lag + span, n], y[l:l + span, m], 20)
+                np.testing.assert_allclose(got[l, n, m], expected, rtol=1e-8, atol=1e-12)
+
+
+def test_cached_result_does_not_query_companies(tmp_path, monkeypatch):
+    days = pd.bdate_range("2025-01-02", periods=80)
+    pd.DataFrame({
+        "DATE": days.strftime("%Y%m%d"), "SECTOR": "반도체", "CNT": np.arange(80) % 7,
+    }).to_csv(tmp_path / "sector.csv", index=False)
+    series = np.zeros(80, dtype=PRICE_DTYPE)
+    series["trade_date"] = days.to_numpy().astype("datetime64[D]")
+    series["closing_price"] = 1000 + np.arange(80) % 5
+    write_price_series("005930", series, str(tmp_path))
+
+    keywords = {"반도체": ["삼성전자"]}
+    lookups = []
+    monkeypatch.setattr(correlation, "keywords_config", lambda: keywords)
+    monkeypatch.setattr(correlation, "map_keywords_to_companies", lambda kw: lookups.append(kw) or {"삼성전자": "005930"})
+    monkeypatch.setattr(correlation, "_cache", {})
+    monkeypatch.setattr(correlation, "_company_map", {})
+
+    first = correlation.news_return_correlation(data_dir=str(tmp_path), store_dir=str(tmp_path), window=20)
+    second = correlation.news_return_correlation(data_dir=str(tmp_path), store_dir=str(tmp_path), window=20)
+
+    assert second is first
+    assert len(lookups) == 1
+    assert first["targets"] == ["005930", "THEME:반도체"]
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import text
+
+from app.database import SingleWriter
+
+
+def test_writer_survives_session_creation_failure(db):
+    calls = {"n": 0}
+
+    def flaky_factory():
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("cannot open database")
+        return db
+
+    writer = SingleWriter(flaky_factory)
+
+    # 세션을 못 만든 배치는 예외로 끝나고, 호출한 쪽이 멈춰 있지 않음
+    with pytest.raises(RuntimeError, match="cannot open database"):
+        writer.submit(lambda session: 1).result(timeout=5)
+
+    # 쓰기 스레드는 그대로 살아서 다음 작업을 처리
+    assert writer.submit(lambda session: session.execute(text("SELECT 2")).scalar()).result(timeout=5) == 2
+    assert writer._thread.is_alive()
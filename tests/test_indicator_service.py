@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from app.models.models import StockIndicator
+from app.services import indicator_service
+from app.services.price_store import PRICE_DTYPE, load_price_series, write_price_series
+
+
+def _series(bars: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    close = 1000 + np.cumsum(rng.normal(0, 10, bars))
+    series = np.zeros(bars, dtype=PRICE_DTYPE)
+    series["trade_date"] = pd.bdate_range("2025-01-02", periods=bars).to_numpy().astype("datetime64[D]")
+    series["closing_price"] = close
+    series["highest_price"] = close + 5
+    series["lowest_price"] = close - 5
+    series["trading_volume"] = rng.integers(1_000, 5_000, bars)
+    return series
+
+
+def test_update_indicators_resumes_each_code_from_its_own_date(db, tmp_path, monkeypatch):
+    # 쓰기 스레드 대신 테스트 세션에 바로 쓰고, 컬럼 저장소는 임시 폴더 사용
+    monkeypatch.setattr(indicator_service, "db_writer", SimpleNamespace(run=lambda fn: fn(db)))
+    monkeypatch.setattr(indicator_service, "load_price_series", lambda code: load_price_series(code, tmp_path))
+
+    full = {"000001": _series(65, 1), "000002": _series(70, 2), "000003": _series(70, 3)}
+    behind = {"000001": 5, "000002": 1, "000003": 1}
+    for code, series in full.items():
+        write_price_series(code, series[:-behind[code]], tmp_path)
+    indicator_service.update_indicators(db, dict.fromkeys(full))
+
+    # 종목마다 밀린 봉 수가 다름 → 각자 자기 첫 신규 거래일부터
+    for code, series in full.items():
+        write_price_series(code, series, tmp_path)
+    since_by_code = {
+        code: pd.Timestamp(series["trade_date"][-behind[code]]).date() for code, series in full.items()
+    }
+    written = indicator_service.update_indicators(db, since_by_code)
+    assert written == sum(behind.values())
+
+    # 이어서 계산한 값이 처음부터 다시 계산한 값과 같음
+    for code, series in full.items():
+        expected, _ = indicator_service.compute_indicators(
+            series["closing_price"], series["highest_price"], series["lowest_price"],
+            series["trading_volume"].astype("float64"),
+        )
+        stored = db.query(StockIndicator).filter_by(stock_code=code).order_by(StockIndicator.trade_date).all()
+        assert len(stored) == len(series)
+        for field in ("ema_26", "macd_signal", "rsi_14", "atr_14", "sma_60"):
+            np.testing.assert_allclose(
+                [getattr(row, field) if getattr(row, field) is not None else np.nan for row in stored],
+                expected[field], rtol=1e-9,
+            )
@@ -0,0 +1,87 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from app.services.krx_client import CSV_PATH, OTP_PATH, KrxClient
+
+CSV_BODY = "일자,종가\n2025/06/30,1000\n"
+
+
+class StandInKrx(BaseHTTPRequestHandler):
+    """OTP / CSV 고정 응답을 주는 KRX 대역 서버 (첫 CSV 요청은 500 으로 실패)"""
+
+    state = {"in_flight": 0, "max_in_flight": 0, "csv_calls": 0}
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        with self.lock:
+            self.state["in_flight"] += 1
+            self.state["max_in_flight"] = max(self.state["max_in_flight"], self.state["in_flight"])
+        try:
+            time.sleep(0.05)
+            if self.path == OTP_PATH:
+                self._reply(200, f"OTP-{body['isuCd'][0]}".encode())
+            elif self.path == CSV_PATH:
+                with self.lock:
+                    self.state["csv_calls"] += 1
+                    first = self.state["csv_calls"] == 1
+                if first:
+                    self._reply(500, b"temporary error")
+                else:
+                    self._reply(200, f"{body['code'][0]}\n{CSV_BODY}".encode("euc-kr"))
+            else:
+                self._reply(404, b"")
+        finally:
+            with self.lock:
+                self.state["in_flight"] -= 1
+
+    def _reply(self, status, payload):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def krx_server():
+    StandInKrx.state.update(in_flight=0, max_in_flight=0, csv_calls=0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInKrx)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_many_against_stand_in_server(krx_server):
+    client = KrxClient(base_url=krx_server, max_workers=3, requests_per_sec=0, backoff=0.01)
+    codes = [f"KR{i:010d}" for i in range(6)]
+
+    results = {}
+    for code, res, error in client.fetch_many(lambda c: client.fetch_price_history(c, "20250101", "20250630"), codes):
+        assert error is None
+        results[code] = res.text
+
+    # 첫 CSV 요청의 500 은 재시도로 복구되고, 응답은 EUC-KR 로 디코딩됨
+    assert {code: text.splitlines()[0] for code, text in results.items()} == {c: f"OTP-{c}" for c in codes}
+    assert all(text.endswith(CSV_BODY) for text in results.values())
+    assert 1 < StandInKrx.state["max_in_flight"] <= 3
+
+
+def test_session_keeps_cloudscraper_tls_adapter():
+    client = KrxClient(max_workers=4)
+    https_adapter = client.session.adapters["https://"]
+    assert type(https_adapter).__name__ == "CipherSuiteAdapter"
+    assert https_adapter.poolmanager.connection_pool_kw["maxsize"] == 4
+    assert client.session.adapters["http://"].poolmanager.connection_pool_kw["maxsize"] == 4
+
+    # 풀 크기만 다르고 TLS 설정(암호 스위트/곡선)은 세션을 만든 cloudscraper 설정 그대로
+    assert https_adapter.cipherSuite == client.session.cipherSuite
+    assert https_adapter.ecdhCurve == client.session.ecdhCurve
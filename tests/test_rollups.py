@@ -0,0 +1,35 @@
+import pandas as pd
+
+from yeongho.rollups import Rollups, period_label, window_start
+
+
+def _rollups():
+    # 2025-06-02(월) ~ 2025-06-30(월) 매일 1건, 키워드 A/B 번갈아
+    days = pd.date_range("2025-06-02", "2025-06-30")
+    dates = days.strftime("%Y%m%d")
+    sector_df = pd.DataFrame({"DATE": dates, "SECTOR": "AI", "CNT": 1})
+    keyword_df = pd.DataFrame({"DATE": dates, "SECTOR": "AI", "KEYWORD": ["A", "B"] * 14 + ["A"], "CNT": 1})
+    return Rollups(sector_df, keyword_df)
+
+
+def test_week_and_month_windows_start_mid_period_like_the_old_charts():
+    rollups = _rollups()
+    # 지금 2025-06-30 15시, 2주 전 → 06-17(화) 부터 (06-16 15시 이후의 날짜)
+    since = window_start(pd.DateOffset(weeks=2), pd.Timestamp("2025-06-30 15:00"))
+    assert since == pd.Timestamp("2025-06-17")
+
+    weeks = rollups.sector_series("AI", "week", since)
+    assert {period_label(k, "week"): v for k, v in weeks.items()} == {
+        "2025-06-16/2025-06-22": 6,  # 첫 주는 06-17 ~ 06-22 만
+        "2025-06-23/2025-06-29": 7,
+        "2025-06-30/2025-07-06": 1,
+    }
+
+    months = rollups.keyword_frame("AI", "month", pd.Timestamp("2025-06-17"), keywords=["A"])
+    assert months.to_dict() == {"A": {202506: 7}}
+
+
+def test_period_labels_keep_the_dashboard_format():
+    assert period_label(20250630, "day") == "2025-06-30"
+    assert period_label(202527, "week") == "2025-06-30/2025-07-06"
+    assert period_label(202506, "month") == "2025-06"
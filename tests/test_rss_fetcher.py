@@ -0,0 +1,107 @@
+import asyncio
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from yeongho import rss_fetcher
+from yeongho.crawler import collect_google_news_by_keywords
+from yeongho.rss_fetcher import RSS_STATE_FILE
+
+
+def _feed(urls: list[str]) -> bytes:
+    now = datetime.now(timezone.utc)
+    items = "".join(
+        f"<item><title>기사 {i}</title><link>{url}</link>"
+        f"<pubDate>{format_datetime(now - timedelta(hours=i))}</pubDate>"
+        f"<description>&lt;a href=\"{url}\"&gt;서로 다른 기사 본문 {i} 고유단어{i * 7}&lt;/a&gt;</description>"
+        f"<source url=\"http://media\">매체</source></item>"
+        for i, url in enumerate(urls)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+
+class StandInRss(BaseHTTPRequestHandler):
+    """ETag 를 붙인 고정 피드를 주는 RSS 대역 서버 (If-None-Match 가 같으면 304)"""
+
+    feed = {"etag": '"v1"', "urls": []}
+    statuses = []
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == self.feed["etag"]:
+            self.statuses.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = _feed(self.feed["urls"])
+        self.statuses.append(200)
+        self.send_response(200)
+        self.send_header("ETag", self.feed["etag"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def rss_server(monkeypatch):
+    StandInRss.feed.update(etag='"v1"', urls=[f"http://news/{i}" for i in range(3)])
+    StandInRss.statuses.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInRss)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(rss_fetcher, "RSS_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/rss")
+    yield StandInRss
+    server.shutdown()
+    server.server_close()
+
+
+def test_collect_uses_etag_and_seen_urls_across_runs(rss_server, tmp_path):
+    save_dir = str(tmp_path)
+    keywords = {"반도체": ["삼성전자"]}
+
+    first = collect_google_news_by_keywords(keywords, save_dir=save_dir, max_workers=1)
+    assert first["fetched"] == 3
+
+    # ETag 와 저장한 URL 이 상태 파일에 남음
+    with open(os.path.join(save_dir, RSS_STATE_FILE), encoding="utf-8") as f:
+        state = json.load(f)["반도체/삼성전자"]
+    assert state["etag"] == '"v1"'
+    assert sorted(state["seen"]) == [f"http://news/{i}" for i in range(3)]
+
+    # 다음 실행은 저장된 ETag 로 조건부 요청 → 304
+    second = collect_google_news_by_keywords(keywords, save_dir=save_dir, max_workers=1)
+    assert second["fetched"] == 0
+    assert rss_server.statuses == [200, 304]
+
+    # 피드가 바뀌면 이미 본 URL 은 건너뛰고 새 기사만
+    rss_server.feed.update(etag='"v2"', urls=["http://news/new", *rss_server.feed["urls"]])
+    third = collect_google_news_by_keywords(keywords, save_dir=save_dir, max_workers=1)
+    assert third["fetched"] == 1
+    assert rss_server.statuses == [200, 304, 200]
+
+    with open(os.path.join(save_dir, RSS_STATE_FILE), encoding="utf-8") as f:
+        state = json.load(f)["반도체/삼성전자"]
+    assert state["etag"] == '"v2"'
+    assert "http://news/new" in state["seen"]
+
+
+def test_fetch_feed_skips_seen_urls(rss_server):
+    state = {"반도체/삼성전자": {"seen": ["http://news/0", "http://news/2"]}}
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await rss_fetcher.fetch_feed(client, "반도체", "삼성전자", state)
+
+    result = asyncio.run(fetch())
+    assert result["status"] == 200
+    assert result["skipped"] == 2
+    assert [e.links[0].href for e in result["entries"]] == ["http://news/1"]
+    assert result["etag"] == '"v1"'
@@ -0,0 +1,28 @@
+from datetime import date
+
+from sqlalchemy import event
+
+from app.crud.sector_crud import _with_next_dates
+from app.models.models import Stock
+
+
+def test_with_next_dates_adds_following_trading_day_in_one_query(db):
+    stored = [date(2025, 6, 2), date(2025, 6, 3), date(2025, 6, 5), date(2025, 6, 9)]
+    db.add_all([
+        Stock(stock_name="가", stock_code="000001", trade_date=d, closing_price=1.0)
+        for d in stored
+    ])
+    db.commit()
+
+    statements = []
+    engine = db.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        # 6/4 처럼 저장되지 않은 날짜도 그 다음 거래일(6/5)을 찾고, 마지막 날짜는 다음이 없음
+        result = _with_next_dates(db, {date(2025, 6, 2), date(2025, 6, 4), date(2025, 6, 9)})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert result == [date(2025, 6, 2), date(2025, 6, 3), date(2025, 6, 4), date(2025, 6, 5), date(2025, 6, 9)]
+    assert len(statements) == 1
@@ -0,0 +1,87 @@
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import event
+
+from app.crud.stock_crud import (
+    build_market_rows,
+    clear_derived_pending,
+    get_derived_pending,
+    get_price_history,
+    mark_derived_pending,
+)
+from app.models.models import Company
+from app.services.price_parser import PRICE_COLUMNS
+
+
+def test_build_market_rows_maps_isin_with_several_null_isins(db):
+    db.add_all([
+        Company(company_name="가", company_code="000001", isin_code=None, sector_id=1),
+        Company(company_name="나", company_code="000002", isin_code=None, sector_id=2),
+        Company(company_name="다", company_code="000003", isin_code="KR7000003000", sector_id=None),
+    ])
+    db.commit()
+
+    df = pd.DataFrame({column: [1.0, 2.0, 3.0] for column in PRICE_COLUMNS[1:]})
+    df["stock_code"] = ["000001", "999999", "888888"]
+    df["isin_code"] = ["KR7000001000", "KR7000003000", None]
+
+    rows = build_market_rows(db, df, date(2025, 6, 30))
+
+    assert [(row["stock_code"], row["stock_name"], row["sector_id"]) for row in rows] == [
+        ("000001", "가", 1),
+        ("000003", "다", None),
+    ]
+
+
+def _explain(db, fn):
+    """fn(db) 가 실행한 SELECT 들의 EXPLAIN QUERY PLAN 상세 문자열"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        fn(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    connection = db.connection().connection.dbapi_connection
+    return [
+        " | ".join(row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters))
+        for statement, parameters in statements
+    ]
+
+
+def test_price_history_range_query_uses_code_date_index(db):
+    plans = _explain(db, lambda s: get_price_history(
+        s, "005930", start=date(2025, 1, 1), end=date(2025, 6, 30), after=date(2025, 3, 1), limit=100,
+    ))
+
+    assert len(plans) == 1
+    # 종목코드 등치 + 날짜 범위 모두 인덱스 탐색으로 처리
+    assert "USING INDEX ux_stocks_code_date (stock_code=? AND trade_date>" in plans[0]
+    # 인덱스 순서 그대로 읽으므로 정렬용 임시 B-tree 가 없어야 함
+    assert "TEMP B-TREE" not in plans[0]
+
+
+def test_derived_pending_keeps_earliest_date_and_clears_only_processed_version(db):
+    mark_derived_pending(db, {"000001": date(2025, 6, 3), "000002": date(2025, 6, 3)})
+    mark_derived_pending(db, {"000001": date(2025, 6, 2)})
+    mark_derived_pending(db, {"000001": date(2025, 6, 4)})
+    db.commit()
+
+    pending = get_derived_pending(db)
+    assert {code: since for code, (since, _) in pending.items()} == {
+        "000001": date(2025, 6, 2),
+        "000002": date(2025, 6, 3),
+    }
+
+    # 반영하는 사이에 다시 기록된 종목은 지우지 않음
+    mark_derived_pending(db, {"000002": date(2025, 6, 5)})
+    clear_derived_pending(db, pending)
+    db.commit()
+    assert list(get_derived_pending(db)) == ["000002"]
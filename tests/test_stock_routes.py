@@ -0,0 +1,36 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import jobs, stocks
+
+
+def test_sync_price_data_runs_as_background_job(monkeypatch):
+    calls = []
+
+    def fake_sync(codes, on_progress=None):
+        calls.append(codes)
+        for code in codes:
+            on_progress(code, True, 1)
+        return {"success": len(codes), "fail": 0, "skipped": 0}
+
+    monkeypatch.setattr(stocks, "sync_stock_price", fake_sync)
+    app = FastAPI()
+    app.include_router(stocks.router)
+    app.include_router(jobs.router)
+    client = TestClient(app)
+
+    res = client.post("/api/stocks/sync-price-data", json={"stocks": ["KR1", "KR2", "KR1"]})
+    assert res.status_code == 202
+    job_id = res.json()["job_id"]
+
+    for _ in range(100):
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            break
+        time.sleep(0.01)
+    assert job["kind"] == "sync-price-data"
+    assert job["status"] == "done"
+    assert job["codes"] == {"KR1": "success", "KR2": "success"}
+    assert calls == [["KR1", "KR2"]]
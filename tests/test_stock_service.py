@@ -0,0 +1,22 @@
+from datetime import date
+from types import SimpleNamespace
+
+from app.crud.stock_crud import get_derived_pending, mark_derived_pending
+from app.services import stock_service
+
+
+def test_flush_derived_refreshes_in_chunks_with_per_code_since(db, monkeypatch):
+    monkeypatch.setattr(stock_service, "db_writer", SimpleNamespace(run=lambda fn: fn(db)))
+    calls = []
+    monkeypatch.setattr(stock_service, "after_ingest", lambda _db, since_by_code, dates: calls.append(since_by_code))
+
+    since = {f"00000{i}": date(2025, 6, 20 + i) for i in range(5)}
+    mark_derived_pending(db, since)
+    db.commit()
+
+    assert stock_service.flush_derived(db, chunk_size=2) == 5
+
+    # 2 + 2 + 1 종목씩, 각 종목은 자기 날짜 그대로
+    assert [len(chunk) for chunk in calls] == [2, 2, 1]
+    assert {code: day for chunk in calls for code, day in chunk.items()} == since
+    assert get_derived_pending(db) == {}
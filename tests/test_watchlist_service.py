@@ -0,0 +1,29 @@
+import numpy as np
+
+from app.services import watchlist_service
+from app.services.price_store import PRICE_DTYPE
+
+
+def _series(rows):
+    series = np.zeros(len(rows), dtype=PRICE_DTYPE)
+    for i, (day, high, low, close) in enumerate(rows):
+        series[i]["trade_date"] = np.datetime64(day)
+        series[i]["highest_price"] = high
+        series[i]["lowest_price"] = low
+        series[i]["closing_price"] = close
+    return series
+
+
+def test_build_quote_ignores_halted_days_in_52_week_range(monkeypatch):
+    series = _series([
+        ("2025-06-25", 110.0, 90.0, 100.0),
+        ("2025-06-26", 0.0, 0.0, 0.0),          # 거래정지
+        ("2025-06-27", np.nan, np.nan, np.nan),  # 값 없음
+        ("2025-06-30", 120.0, 95.0, 105.0),
+    ])
+    monkeypatch.setattr(watchlist_service, "load_price_series", lambda code: series)
+
+    quote = watchlist_service.build_quote("000001")
+
+    assert quote["high_52w"] == 120.0
+    assert quote["low_52w"] == 90.0
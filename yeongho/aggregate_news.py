@@ -1,62 +1,141 @@
 import os
+import json
+import multiprocessing
 import pandas as pd
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
+MANIFEST_FILE = ".aggregate_manifest.json"
+KEYWORD_COLUMNS = ["DATE", "SECTOR", "KEYWORD", "CNT"]
+SECTOR_COLUMNS = ["DATE", "SECTOR", "CNT"]
+# 이 개수 이상을 다시 셀 때만 프로세스 풀 사용 (적으면 띄우는 비용이 더 큼)
+PARALLEL_MIN_FILES = 64
 
-def aggregate_news_counts(news_dir="yeongho/NewsData", output_dir="yeongho/DATA"):
+
+def count_news_files(file_paths: list[str]) -> tuple[pd.DataFrame, pd.DataFrame, list[str]]:
+    """날짜 파일들 → (키워드별 건수, 섹터별 건수, 실패한 파일명) — 파일을 모두 이어 붙여 groupby 한 번으로 셈"""
+    frames, failed = [], []
+    for file_path in file_paths:
+        filename = os.path.basename(file_path)
+        try:
+            df = pd.read_csv(file_path, usecols=["SECTOR", "KEYWORD"])
+            frames.append(df.assign(DATE=filename.replace(".csv", "")))
+        except Exception as file_error:
+            print(f"❌ 파일 처리 실패: {filename} | {file_error}")
+            failed.append(filename)
+
+    if not frames:
+        return pd.DataFrame(columns=KEYWORD_COLUMNS), pd.DataFrame(columns=SECTOR_COLUMNS), failed
+    df = pd.concat(frames, ignore_index=True)
+    keyword_df = df.groupby(["DATE", "SECTOR", "KEYWORD"], sort=False).size().reset_index(name="CNT")
+    sector_df = df.groupby(["DATE", "SECTOR"], sort=False).size().reset_index(name="CNT")
+    return keyword_df, sector_df, failed
+
+
+def _file_versions(news_dir: str, csv_files: list[str]) -> dict:
+    versions = {}
+    for filename in csv_files:
+        stat = os.stat(os.path.join(news_dir, filename))
+        versions[filename] = [stat.st_mtime_ns, stat.st_size]
+    return versions
+
+
+def _load_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_csv(df: pd.DataFrame, path: str):
+    tmp_path = f"{path}.tmp"
+    df.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+    os.replace(tmp_path, path)
+
+
+def _count_files(paths: list[str], workers: int | None) -> tuple[pd.DataFrame, pd.DataFrame, list[str]]:
+    if len(paths) < PARALLEL_MIN_FILES or workers == 1:
+        return count_news_files(paths)
+
+    # 전체 재집계 — 파일 묶음을 프로세스마다 나눠 세고 결과만 합침
+    workers = workers or os.cpu_count() or 1
+    size = -(-len(paths) // (workers * 4))
+    chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+    # 파이프라인 스레드에서도 불리므로 fork 대신 spawn
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        results = list(executor.map(count_news_files, chunks))
+    return (
+        pd.concat([k for k, _, _ in results], ignore_index=True),
+        pd.concat([s for _, s, _ in results], ignore_index=True),
+        [f for _, _, failed in results for f in failed],
+    )
+
+
+def aggregate_news_counts(news_dir="yeongho/NewsData", output_dir="yeongho/DATA", full=False, workers=None):
     """
     📊 날짜별 뉴스 기사 데이터를 집계하여 키워드 및 섹터 기준 CSV로 저장합니다.
-    
+
     - 입력: news_dir 안에 존재하는 YYYYMMDD.csv 형태의 파일들
     - 출력: output_dir에 keyword.csv, sector.csv 저장
+    - 지난 집계 이후 바뀐(mtime/크기) 날짜 파일만 다시 세어 기존 집계에 합침
+    - full=True 이거나 이전 집계가 없으면 전체를 다시 셈 (파일이 많으면 프로세스 풀 사용)
+    - 반환: 다시 센(또는 사라진) 날짜 목록 ["YYYYMMDD", ...]
     """
-    keyword_stats = []  # (DATE, SECTOR, KEYWORD, CNT)
-    sector_stats = []   # (DATE, SECTOR, CNT)
-
     try:
         csv_files = sorted(f for f in os.listdir(news_dir) if f.endswith(".csv"))
         if not csv_files:
             print("⚠️ 뉴스 CSV 파일이 없습니다.")
-            return
+            return []
 
-        for filename in csv_files:
-            file_path = os.path.join(news_dir, filename)
-            date_str = filename.replace(".csv", "")
-
-            try:
-                df = pd.read_csv(file_path)
-
-                keyword_counts = defaultdict(int)
-                sector_counts = defaultdict(int)
+        os.makedirs(output_dir, exist_ok=True)
+        keyword_path = os.path.join(output_dir, "keyword.csv")
+        sector_path = os.path.join(output_dir, "sector.csv")
+        manifest_path = os.path.join(output_dir, MANIFEST_FILE)
 
-                for _, row in df.iterrows():
-                    keyword_counts[(row["SECTOR"], row["KEYWORD"])] += 1
-                    sector_counts[row["SECTOR"]] += 1
+        versions = _file_versions(news_dir, csv_files)
+        manifest = {} if full else _load_json(manifest_path)
+        if not (os.path.exists(keyword_path) and os.path.exists(sector_path)):
+            manifest = {}
 
-                keyword_stats.extend(
-                    (date_str, sector, keyword, count)
-                    for (sector, keyword), count in keyword_counts.items()
-                )
-                sector_stats.extend(
-                    (date_str, sector, count)
-                    for sector, count in sector_counts.items()
-                )
+        changed = [f for f in csv_files if manifest.get(f) != versions[f]]
+        removed = [f for f in manifest if f not in versions]
+        if not changed and not removed:
+            print("✅ 변경된 뉴스 파일 없음 — 집계 생략")
+            return []
 
-            except Exception as file_error:
-                print(f"❌ 파일 처리 실패: {filename} | {file_error}")
+        new_keyword_df, new_sector_df, failed = _count_files([os.path.join(news_dir, f) for f in changed], workers)
+        failed = set(failed)
 
-        os.makedirs(output_dir, exist_ok=True)
+        if manifest:
+            keyword_df = pd.read_csv(keyword_path, dtype={"DATE": str})
+            sector_df = pd.read_csv(sector_path, dtype={"DATE": str})
+        else:
+            keyword_df = pd.DataFrame(columns=KEYWORD_COLUMNS)
+            sector_df = pd.DataFrame(columns=SECTOR_COLUMNS)
 
-        keyword_df = pd.DataFrame(keyword_stats, columns=["DATE", "SECTOR", "KEYWORD", "CNT"])
-        sector_df = pd.DataFrame(sector_stats, columns=["DATE", "SECTOR", "CNT"])
+        # 다시 센 날짜의 예전 집계는 빼고 새 집계로 교체
+        stale_dates = {f.replace(".csv", "") for f in changed + removed} - {f.replace(".csv", "") for f in failed}
+        keyword_df = pd.concat(
+            [keyword_df[~keyword_df["DATE"].isin(stale_dates)], new_keyword_df], ignore_index=True
+        ).sort_values("DATE", kind="stable")
+        sector_df = pd.concat(
+            [sector_df[~sector_df["DATE"].isin(stale_dates)], new_sector_df], ignore_index=True
+        ).sort_values("DATE", kind="stable")
 
-        keyword_path = os.path.join(output_dir, "keyword.csv")
-        sector_path = os.path.join(output_dir, "sector.csv")
+        _write_csv(keyword_df[KEYWORD_COLUMNS], keyword_path)
+        _write_csv(sector_df[SECTOR_COLUMNS], sector_path)
 
-        keyword_df.to_csv(keyword_path, index=False, encoding="utf-8-sig")
-        sector_df.to_csv(sector_path, index=False, encoding="utf-8-sig")
+        # 실패한 파일은 예전 버전을 그대로 두어 다음 집계에서 다시 시도
+        new_manifest = {f: v for f, v in versions.items() if f not in failed}
+        for f in failed:
+            if f in manifest:
+                new_manifest[f] = manifest[f]
+        with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as fp:
+            json.dump(new_manifest, fp)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
 
-        print(f"✅ 집계 완료 및 저장됨:\n - {keyword_path}\n - {sector_path}")
+        print(f"✅ 집계 완료 및 저장됨 (다시 센 날짜 {len(stale_dates)}개):\n - {keyword_path}\n - {sector_path}")
+        return sorted(stale_dates)
 
     except Exception as dir_error:
         print(f"❌ 디렉토리 접근 실패: {dir_error}")
+        return []
@@ -0,0 +1,110 @@
+import random
+import time
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from yeongho.crawler import clean_text
+from yeongho.dedup_index import NearDuplicateIndex, iter_terms
+
+COMMON_WORDS = [f"일반{i}" for i in range(3000)]
+TOPIC_WORDS = 300
+
+
+def make_day(articles: int = 10_000, keys: int = 10, dup_ratio: float = 0.3, seed: int = 0) -> list[tuple]:
+    """
+    (키, 설명) 목록 — 같은 키(키워드)의 기사는 키워드와 주제 단어를 공유함
+
+    - 모든 기사에 키워드가 들어가고, 주제 단어 300개에서 지프 분포로 뽑아 자주 쓰는 단어가 겹침
+    - dup_ratio 비율은 앞선 기사에서 단어 한두 개를 바꾸거나 더한 유사 기사
+    """
+    rng = random.Random(seed)
+    topic_weights = [1 / (i + 1) for i in range(TOPIC_WORDS)]
+    day, by_key = [], {}
+    for _ in range(articles):
+        key = rng.randrange(keys)
+        previous = by_key.setdefault(key, [])
+        if previous and rng.random() < dup_ratio:
+            words = rng.choice(previous).split()
+            for _ in range(rng.randint(1, 2)):
+                if rng.random() < 0.5:
+                    words[rng.randrange(1, len(words))] = rng.choice(COMMON_WORDS)
+                else:
+                    words.append(rng.choice(COMMON_WORDS))
+        else:
+            topic = [f"주제{key}_{i}" for i in rng.choices(range(TOPIC_WORDS), topic_weights, k=rng.randint(6, 12))]
+            words = [f"키워드{key}", *topic, *rng.sample(COMMON_WORDS, rng.randint(2, 6))]
+        text = " ".join(words)
+        previous.append(text)
+        day.append((key, text))
+    return day
+
+
+def legacy_is_similar(new_desc, existing_descs, threshold=0.85):
+    # 이전 경로: 기사마다 전체 설명을 다시 정제하고 TF-IDF 를 새로 학습
+    cleaned_existing = [clean_text(d) for d in existing_descs]
+    if not cleaned_existing:
+        return False
+    matrix = TfidfVectorizer().fit_transform([clean_text(new_desc)] + cleaned_existing)
+    return (cosine_similarity(matrix[0:1], matrix[1:]) > threshold).any()
+
+
+def run_legacy(day) -> tuple[float, list[bool]]:
+    started = time.perf_counter()
+    existing, decisions = {}, []
+    for key, text in day:
+        dup = legacy_is_similar(text, existing.setdefault(key, []))
+        if not dup:
+            existing[key].append(text)
+        decisions.append(bool(dup))
+    return time.perf_counter() - started, decisions
+
+
+def run_index(day) -> tuple[float, list[bool], list[int]]:
+    """(걸린 시간, 판정, 조회마다 다시 확인한 후보 수)"""
+    started = time.perf_counter()
+    indexes, decisions, candidates = {}, [], []
+    cleaned = [clean_text(text) for _, text in day]
+    for (key, _), text, terms in zip(day, cleaned, iter_terms(cleaned)):
+        index = indexes.setdefault(key, NearDuplicateIndex())
+        candidates.append(len(index.candidates(terms)))
+        decisions.append(index.check_and_add(text, terms))
+    return time.perf_counter() - started, decisions, candidates
+
+
+def _per_article_ms(day, part) -> float:
+    # 인덱스가 커진 뒤에도 기사당 비용이 그대로인지 — 앞/뒤 구간만 따로 측정
+    indexes = {}
+    cleaned = [clean_text(text) for _, text in day]
+    terms = list(iter_terms(cleaned))
+    timings = []
+    for (key, _), text, t in zip(day, cleaned, terms):
+        index = indexes.setdefault(key, NearDuplicateIndex())
+        started = time.perf_counter()
+        index.check_and_add(text, t)
+        timings.append(time.perf_counter() - started)
+    chunk = timings[:part] if part > 0 else timings[part:]
+    return sum(chunk) / len(chunk) * 1000
+
+
+def main(articles: int = 10_000, legacy_articles: int = 2_000):
+    day = make_day(articles)
+    elapsed, decisions, candidates = run_index(day)
+    print(f"📰 합성 하루치 {articles:,}건 (키 10개, 키마다 키워드/주제 단어 공유)")
+    print(f" - 인덱스: {elapsed:.2f}s ({articles / elapsed:,.0f}건/s), 유사 판정 {sum(decisions):,}건, "
+          f"조회당 후보 평균 {sum(candidates) / len(candidates):.1f}개")
+
+    # 한 키에 모든 기사가 몰려도 조회 비용이 저장된 문서 수에 비례하지 않는지
+    single = make_day(articles, keys=1, seed=1)
+    print(f" - 한 키에 {articles:,}건: 앞 1,000건 {_per_article_ms(single, 1000):.3f}ms/건, "
+          f"뒤 1,000건 {_per_article_ms(single, -1000):.3f}ms/건")
+
+    # 기존 경로는 제곱 비용이라 앞부분만 측정
+    sample = day[:legacy_articles]
+    legacy_elapsed, legacy_decisions = run_legacy(sample)
+    index_elapsed, index_decisions, _ = run_index(sample)
+    agree = sum(a == b for a, b in zip(legacy_decisions, index_decisions)) / len(sample)
+    print(f" - 앞 {legacy_articles:,}건 비교: 기존 {legacy_elapsed:.2f}s / 인덱스 {index_elapsed:.3f}s "
+          f"({legacy_elapsed / index_elapsed:.0f}x), 판정 일치율 {agree:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import os
+import re
+import time
+import threading
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.database import SessionLocal
+from app.models.models import Company
+from app.services.price_store import STORE_DIR, load_price_series
+from yeongho.dashboard_cache import keywords_config
+
+DATA_DIR = "yeongho/DATA"
+DEFAULT_MAX_LAG = 5
+DEFAULT_WINDOW = 60
+# 구간 안에서 수익률이 관측된 거래일이 이보다 적으면 상관계수를 NaN 으로 둠
+MIN_PERIODS = 20
+THEME_PREFIX = "THEME:"
+# 뉴스 시계열 단위 — 섹터별 또는 섹터/키워드별 기사 수
+LEVELS = ("sector", "keyword")
+
+# 상장사 목록은 거의 바뀌지 않으므로 키워드 → 종목코드 매핑은 이 간격(초)으로만 DB 에서 다시 읽음
+COMPANY_MAP_TTL = 600
+
+_cache = {}
+_company_map = {}
+_cache_lock = threading.Lock()
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"\s+", "", str(name)).lower()
+
+
+def _theme(sector: str) -> str:
+    # "반도체_이슈" 뉴스도 "반도체" 테마 수익률과 비교
+    return sector.split("_")[0]
+
+
+def map_keywords_to_companies(keywords: dict, db=None) -> dict[str, str]:
+    """
+    🔗 키워드 중 상장사 이름과 같은 것을 종목코드로 매핑합니다. (공백/대소문자 무시)
+
+    - 반환: {키워드: 종목코드}
+    """
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        by_name = {
+            _normalize(name): code
+            for name, code in db.query(Company.company_name, Company.company_code)
+            .filter(Company.company_code.isnot(None))
+        }
+    finally:
+        if own_session:
+            db.close()
+
+    return {
+        keyword: by_name[_normalize(keyword)]
+        for words in keywords.values()
+        for keyword in words
+        if _normalize(keyword) in by_name
+    }
+
+
+def _keyword_companies() -> tuple[dict, dict[str, str]]:
+    """(키워드 설정, {키워드: 종목코드}) — 설정 파일이 그대로면 TTL 동안 DB 를 다시 조회하지 않음"""
+    # keywords_config() 는 파일이 바뀌기 전까지 같은 객체를 돌려주므로 객체가 같으면 설정도 같음
+    keywords = keywords_config()
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _company_map.get("entry")
+        if cached and cached[0] is keywords and now < cached[1]:
+            return keywords, cached[2]
+
+    company_codes = map_keywords_to_companies(keywords)
+    with _cache_lock:
+        _company_map["entry"] = (keywords, now + COMPANY_MAP_TTL, company_codes)
+    return keywords, company_codes
+
+
+def _check_level(level: str):
+    if level not in LEVELS:
+        raise ValueError(f"알 수 없는 level: {level} ({' 또는 '.join(LEVELS)})")
+
+
+def load_news_matrix(level: str = "sector", data_dir: str = DATA_DIR) -> pd.DataFrame:
+    """날짜 × 뉴스 시계열(섹터 또는 섹터/키워드) 기사 수 행렬"""
+    _check_level(level)
+    if level == "sector":
+        df = pd.read_csv(os.path.join(data_dir, "sector.csv"))
+        df["SERIES"] = df["SECTOR"]
+    else:
+        df = pd.read_csv(os.path.join(data_dir, "keyword.csv"))
+        df["SERIES"] = df["SECTOR"] + "/" + df["KEYWORD"]
+    df["DATE"] = pd.to_datetime(df["DATE"].astype(str), format="%Y%m%d")
+    return df.pivot_table(index="DATE", columns="SERIES", values="CNT", aggfunc="sum", fill_value=0)
+
+
+def load_return_matrix(keywords: dict, company_codes: dict[str, str], store_dir: str = STORE_DIR) -> pd.DataFrame:
+    """거래일 × (종목 + 테마 평균) 일간 수익률 행렬 — 앱의 컬럼 저장소에서 읽음"""
+    returns = {}
+    for code in sorted(set(company_codes.values())):
+        series = load_price_series(code, store_dir)
+        if series is None or len(series) < 2:
+            continue
+        close = pd.Series(np.asarray(series["closing_price"]), index=pd.to_datetime(series["trade_date"]))
+        returns[code] = close.where(close > 0).pct_change().iloc[1:]
+    if not returns:
+        return pd.DataFrame()
+
+    stock_returns = pd.DataFrame(returns).sort_index()
+    themes = {}
+    for sector, words in keywords.items():
+        codes = [company_codes[w] for w in words if company_codes.get(w) in stock_returns.columns]
+        if codes:
+            themes[THEME_PREFIX + _theme(sector)] = stock_returns[codes].mean(axis=1)
+    return pd.concat([stock_returns, pd.DataFrame(themes)], axis=1)
+
+
+def align_to_trading_days(news: pd.DataFrame, trading_days: pd.DatetimeIndex) -> pd.DataFrame:
+    """휴장일 기사는 다음 거래일로 넘겨 거래일 기준으로 합산"""
+    pos = trading_days.searchsorted(news.index)
+    inside = pos < len(trading_days)
+    aligned = news[inside].groupby(trading_days[pos[inside]]).sum()
+    return aligned.reindex(trading_days, fill_value=0)
+
+
+def _pearson(n, sx, sy, sxx, syy, sxy, min_periods: int) -> np.ndarray:
+    """합계들로 피어슨 상관 — 관측 수 n 이 min_periods 보다 적거나 분산이 0 이면 NaN"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        corr = cov / np.sqrt(var_x * var_y)
+    return np.where((n >= min_periods) & (var_x > 0) & (var_y > 0), corr, np.nan)
+
+
+def _mask_returns(y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(관측 여부 0/1, 결측을 0 으로 둔 수익률) — 상장 전/거래정지일은 관측 여부 0 으로 각 구간에서 빠짐"""
+    valid = ~np.isnan(y)
+    # 열 평균을 빼 두면 합계 차이로 분산을 구할 때 자릿수 손실이 적음 (상관계수는 그대로)
+    mean = np.nanmean(np.where(valid.any(axis=0), y, 0.0), axis=0)
+    return valid.astype("float64"), np.where(valid, y - mean, 0.0)
+
+
+def lagged_correlations(x: np.ndarray, y: np.ndarray, max_lag: int, min_periods: int = MIN_PERIODS) -> np.ndarray:
+    """
+    corr(x_t, y_{t+lag}) 를 모든 (x, y) 쌍과 lag ∈ [-max_lag, max_lag] 에 대해 한 번에 계산합니다.
+
+    - x: (T, N) 결측 없는 행렬, y: (T, M) — 결측(NaN)은 그 날만 빼고 계산
+    - 반환: (2·max_lag+1, N, M)
+    """
+    span = len(x) - 2 * max_lag
+    if span < 3:
+        raise ValueError("상관계수를 계산하기에 거래일이 부족합니다")
+    xs = x[max_lag:max_lag + span]
+    xs = xs - xs.mean(axis=0)
+    valid, y0 = _mask_returns(y)
+    # (lag, M, span) — 각 lag 만큼 밀린 y 구간을 복사 없이 겹쳐 봄
+    w = sliding_window_view(valid, span, axis=0)
+    yw = sliding_window_view(y0, span, axis=0)
+    return _pearson(
+        w.sum(axis=2)[:, None, :],
+        np.einsum("tn,lmt->lnm", xs, w, optimize=True),
+        yw.sum(axis=2)[:, None, :],
+        np.einsum("tn,lmt->lnm", xs * xs, w, optimize=True),
+        (yw * yw).sum(axis=2)[:, None, :],
+        np.einsum("tn,lmt->lnm", xs, yw, optimize=True),
+        min(span, min_periods),
+    )
+
+
+def rolling_correlations(x: np.ndarray, y: np.ndarray, window: int, min_periods: int = MIN_PERIODS) -> np.ndarray:
+    """
+    길이 window 이동 구간의 (N, M) 상관행렬을 누적합으로 한 번에 계산합니다.
+
+    - y 의 결측(NaN)은 구간마다 그 날만 빼고 계산 (관측이 min_periods 보다 적은 구간은 NaN)
+    - 반환: (T-window+1, N, M)
+    """
+    def window_sum(a):
+        c = np.concatenate([np.zeros((1,) + a.shape[1:]), np.cumsum(a, axis=0)])
+        return c[window:] - c[:-window]
+
+    x = x - x.mean(axis=0)
+    valid, y0 = _mask_returns(y)
+    return _pearson(
+        window_sum(valid)[:, None, :],
+        window_sum(np.einsum("tn,tm->tnm", x, valid)),
+        window_sum(y0)[:, None, :],
+        window_sum(np.einsum("tn,tm->tnm", x * x, valid)),
+        window_sum(y0 * y0)[:, None, :],
+        window_sum(np.einsum("tn,tm->tnm", x, y0)),
+        min(window, min_periods),
+    )
+
+
+def _data_version(level: str, data_dir: str, codes, store_dir: str) -> tuple:
+    paths = [os.path.join(data_dir, "sector.csv" if level == "sector" else "keyword.csv")]
+    paths += [os.path.join(store_dir, f"{code}.npy") for code in sorted(set(codes))]
+    version = []
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            version.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
+
+
+def news_return_correlation(
+    level: str = "sector",
+    max_lag: int = DEFAULT_MAX_LAG,
+    window: int = DEFAULT_WINDOW,
+    data_dir: str = DATA_DIR,
+    store_dir: str = STORE_DIR,
+) -> dict:
+    """
+    📈 뉴스 기사 수와 종목/테마 수익률의 시차 상관 및 이동 상관을 계산합니다.
+
+    - level: "sector" (섹터별 기사 수) 또는 "keyword" (섹터/키워드별 기사 수)
+    - 결과는 입력 파일(집계 CSV, 종목 시세 파일)의 버전이 같으면 캐시에서 반환 (캐시를 확인할 때 DB 는 조회하지 않음)
+    """
+    _check_level(level)
+    keywords, company_codes = _keyword_companies()
+    key = (level, max_lag, window, _data_version(level, data_dir, company_codes.values(), store_dir))
+    with _cache_lock:
+        if key in _cache:
+            return _cache[key]
+
+    returns = load_return_matrix(keywords, company_codes, store_dir)
+    if returns.empty:
+        raise ValueError("수익률을 계산할 종목 시세가 없습니다")
+    news = load_news_matrix(level, data_dir)
+    # 뉴스가 모이기 시작한 이후 거래일만 사용
+    # 상장 전/거래정지일 수익률은 0 으로 채우지 않고 NaN 으로 둬서 상관 계산에서 뺌
+    returns = returns[returns.index >= news.index.min()].dropna(axis=1, how="all")
+    news = align_to_trading_days(news, returns.index)
+
+    x = np.log1p(news.to_numpy(dtype="float64"))
+    y = returns.to_numpy(dtype="float64")
+    result = {
+        "level": level,
+        "news": list(news.columns),
+        "targets": list(returns.columns),
+        "lags": list(range(-max_lag, max_lag + 1)),
+        "lagged": lagged_correlations(x, y, max_lag),
+        "dates": returns.index[window - 1:] if len(returns) >= window else returns.index[:0],
+        "rolling": rolling_correlations(x, y, window) if len(returns) >= window else np.empty((0, x.shape[1], y.shape[1])),
+        "company_codes": company_codes,
+    }
+    with _cache_lock:
+        # 버전이 바뀐 이전 결과는 버림
+        for old in [k for k in _cache if k[:3] == key[:3]]:
+            del _cache[old]
+        _cache[key] = result
+    return result
+
+
+def top_pairs(result: dict, n: int = 20) -> list[dict]:
+    """시차 상관의 절댓값이 큰 (뉴스, 수익률, lag) 조합 상위 n개"""
+    lagged = np.nan_to_num(result["lagged"])
+    flat = np.argsort(-np.abs(lagged), axis=None)[:n]
+    pairs = []
+    for lag_i, news_i, target_i in zip(*np.unravel_index(flat, lagged.shape)):
+        pairs.append({
+            "news": result["news"][news_i],
+            "target": result["targets"][target_i],
+            "lag": result["lags"][lag_i],
+            "corr": round(float(lagged[lag_i, news_i, target_i]), 4),
+        })
+    return pairs
@@ -1,16 +1,12 @@
 import os
 import re
 import json
-import feedparser
-import pandas as pd
+import asyncio
 from datetime import datetime, timedelta
-from urllib.parse import quote
-import urllib.request
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from collections import defaultdict  # 상단 import 추가
+from yeongho.rss_fetcher import RSS_STATE_FILE, load_state, save_state, fetch_feeds, mark_seen, remember_validators
+from yeongho.news_store import open_store, append_day_csv
+from yeongho.dedup_index import NearDuplicateIndex, load_day_index, iter_terms
 
 def load_keywords(filename="keywords.json"):
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -33,14 +29,37 @@ def extract_anchor_text(description: str) -> str:
 
 
 def is_similar_description(new_desc, existing_descs, threshold=0.85):
-    cleaned_new = clean_text(new_desc)
+    index = NearDuplicateIndex(threshold)
     cleaned_existing = [clean_text(d) for d in existing_descs]
     if not cleaned_existing:
         return False
-    corpus = [cleaned_new] + cleaned_existing
-    vectorizer = TfidfVectorizer().fit_transform(corpus)
-    cos_sim = cosine_similarity(vectorizer[0:1], vectorizer[1:])
-    return (cos_sim > threshold).any()
+    for text, terms in zip(cleaned_existing, iter_terms(cleaned_existing)):
+        index.add(text, terms)
+    return index.is_duplicate(clean_text(new_desc))
+
+
+def to_article(sector, keyword, entry, one_year_ago):
+    """RSS 항목 → (YYYYMMDD, 기사 행) — 날짜가 없거나 1년보다 오래되면 None"""
+    if not hasattr(entry, "published_parsed"):
+        return None
+    pub_dt = datetime(*entry.published_parsed[:6])
+    if pub_dt < one_year_ago:
+        return None
+
+    description_text = extract_anchor_text(entry.description) if hasattr(entry, "description") else ""
+    return (
+        pub_dt.strftime("%Y%m%d"),
+        {
+            "SECTOR": sector,
+            "KEYWORD": keyword,
+            "MEDIA": entry.source.title if hasattr(entry, "source") else "",
+            "TITLE": entry.title,
+            "DESCRIPTION": description_text,
+            "URL": entry.links[0].href,
+            "PUBLISHED": pub_dt.strftime("%Y-%m-%d"),
+            "SCRAPED_AT": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    )
 
 
 def collect_google_news_by_keywords(keywords_dict, save_dir="yeongho/NewsData", max_workers=5):
@@ -49,100 +68,71 @@ def collect_google_news_by_keywords(keywords_dict, save_dir="yeongho/NewsData",
 
     results_by_date = {}
     saved_dates = set()
+    saved_sectors = set()
     total_fetched = 0
 
     total_keywords = sum(len(kw_list) for kw_list in keywords_dict.values())
-    print(f"\n📡 뉴스 수집 시작: 총 {total_keywords} 키워드 / {max_workers} threads")
-
-    def fetch_articles(sector, keyword):
-        try:
-            encoded = quote(keyword)
-            rss_url = f"https://news.google.com/rss/search?q={encoded}&hl=ko&gl=KR&ceid=KR:ko"
-            req = urllib.request.Request(rss_url, headers={"User-Agent": "Mozilla/5.0"})
-            with urllib.request.urlopen(req) as res:
-                feed_data = res.read()
-            feed = feedparser.parse(feed_data)
-
-            articles = []
-            for entry in feed.entries:
-                if not hasattr(entry, "published_parsed"):
-                    continue
-                pub_dt = datetime(*entry.published_parsed[:6])
-                if pub_dt < one_year_ago:
-                    continue
-                date_str = pub_dt.strftime("%Y%m%d")
-                display_date = pub_dt.strftime("%Y-%m-%d")
-
-                description_text = extract_anchor_text(entry.description) if hasattr(entry, "description") else ""
-
-                articles.append((
-                    date_str,
-                    {
-                        "SECTOR": sector,
-                        "KEYWORD": keyword,
-                        "MEDIA": entry.source.title if hasattr(entry, "source") else "",
-                        "TITLE": entry.title,
-                        "DESCRIPTION": description_text,
-                        "URL": entry.links[0].href,
-                        "PUBLISHED": display_date,
-                        "SCRAPED_AT": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                ))
-            return (sector, keyword, len(articles), articles)
-        except Exception as e:
-            return (sector, keyword, -1, str(e))
-
-    # 병렬 수집
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [
-            executor.submit(fetch_articles, sector, keyword)
-            for sector, keywords in keywords_dict.items()
-            for keyword in keywords
-        ]
-        for future in as_completed(futures):
-            sector, keyword, count, result = future.result()
-            if count == -1:
-                print(f"❌ [{sector}] '{keyword}' 수집 실패 → {result}")
-            else:
-                print(f"✅ [{sector}] '{keyword}' 완료 ({count}건)")
-                total_fetched += count
-                for date_str, article in result:
-                    results_by_date.setdefault(date_str, []).append(article)
-
-
-    # 날짜별 저장
+    print(f"\n📡 뉴스 수집 시작: 총 {total_keywords} 키워드 / 동시 요청 {max_workers}개")
+
+    # 키워드별 ETag/Last-Modified 와 이미 처리한 URL
+    state_path = os.path.join(save_dir, RSS_STATE_FILE)
+    state = load_state(state_path)
+    feeds = asyncio.run(fetch_feeds(keywords_dict, state, max_workers))
+
+    for feed in feeds:
+        if isinstance(feed, tuple):
+            sector, keyword, error = feed
+            print(f"❌ [{sector}] '{keyword}' 수집 실패 → {error}")
+            continue
+        sector, keyword = feed["sector"], feed["keyword"]
+        if feed["status"] == 304:
+            print(f"⏭️ [{sector}] '{keyword}' 변경 없음 (304)")
+            continue
+
+        articles = []
+        for entry in feed["entries"]:
+            # 링크/제목이 없는 등 형식이 깨진 항목은 건너뛰고 나머지 기사는 계속 수집
+            try:
+                article = to_article(sector, keyword, entry, one_year_ago)
+            except Exception as e:
+                print(f"❌ [{sector}] '{keyword}' 기사 변환 실패 → {e}")
+                continue
+            if article:
+                articles.append(article)
+        print(f"✅ [{sector}] '{keyword}' 완료 ({len(articles)}건, 이미 본 기사 {feed['skipped']}건 건너뜀)")
+        total_fetched += len(articles)
+        for date_str, article in articles:
+            results_by_date.setdefault(date_str, []).append(article)
+
+    # 날짜별 저장 — URL 중복은 전체 기간에서 인덱스로 확인하고, 기사는 추가만 함
+    store = open_store(save_dir)
+    seen_urls = store.existing_urls(a["URL"] for articles in results_by_date.values() for a in articles)
     for date_str, articles in results_by_date.items():
-        file_path = os.path.join(save_dir, f"{date_str}.csv")
-
-        if os.path.exists(file_path):
-            existing_df = pd.read_csv(file_path)
-            existing_urls = set(existing_df["URL"])
-            existing_descs = defaultdict(set)
-            for _, row in existing_df.iterrows():
-                key = (row["SECTOR"], row["KEYWORD"])
-                existing_descs[key].add(row["DESCRIPTION"])
-        else:
-            existing_df = pd.DataFrame()
-            existing_urls = set()
-            existing_descs = defaultdict(set)
+        # (SECTOR, KEYWORD) 별 유사 기사 인덱스 — 저장본이 최신이면 기존 기사를 읽지 않음
+        day_index = load_day_index(
+            save_dir, date_str, store.count_day(date_str), lambda: store.day_frame(date_str), clean_text
+        )
 
         new_articles = []
         filtered_descriptions = []
 
-        for a in articles:
+        cleaned = [clean_text(a["DESCRIPTION"]) for a in articles]
+        for a, text, terms in zip(articles, cleaned, iter_terms(cleaned)):
             key = (a["SECTOR"], a["KEYWORD"])
 
-            if a["URL"] in existing_urls or is_similar_description(a["DESCRIPTION"], existing_descs[key]):
+            if a["URL"] in seen_urls or day_index.get(key).check_and_add(text, terms):
                 filtered_descriptions.append(a["DESCRIPTION"])
                 continue
 
             new_articles.append(a)
-            existing_descs[key].add(a["DESCRIPTION"])
+            seen_urls.add(a["URL"])
 
         if new_articles:
-            combined_df = pd.concat([existing_df, pd.DataFrame(new_articles)], ignore_index=True)
-            combined_df.to_csv(file_path, index=False, encoding="utf-8-sig")
+            store.insert_articles(date_str, new_articles)
+            append_day_csv(save_dir, date_str, new_articles)
+            day_index.save(store.count_day(date_str))
             saved_dates.add(date_str)
+            saved_sectors.update(a["SECTOR"] for a in new_articles)
 
         # 로그 출력
         print(f"\n📅 {date_str} 요약")
@@ -153,6 +143,13 @@ def collect_google_news_by_keywords(keywords_dict, save_dir="yeongho/NewsData",
         if len(filtered_descriptions) > 3:
             print(f"   ...외 {len(filtered_descriptions) - 3}건 추가 필터링됨")
 
+    # 저장까지 끝난 뒤에만 URL/ETag 를 기록 — 중간에 실패하면 다음 수집에서 다시 받음
+    for feed in feeds:
+        if isinstance(feed, dict):
+            mark_seen(state, feed["sector"], feed["keyword"], (e.links[0].href for e in feed["entries"] if e.get("links")))
+            remember_validators(state, feed)
+    save_state(state, state_path)
+    store.close()
 
     print("\n📦 뉴스 수집 요약")
     print(f" - 총 수집 기사 수: {total_fetched}")
@@ -161,3 +158,6 @@ def collect_google_news_by_keywords(keywords_dict, save_dir="yeongho/NewsData",
         print(f" - 저장된 CSV 파일 목록: {sorted(saved_dates)}.csv")
     else:
         print(" - 저장된 새 파일 없음 (모두 중복 또는 유사)")
+
+    # 후속 집계/차트가 바뀐 날짜와 섹터만 처리할 수 있도록 반환
+    return {"fetched": total_fetched, "dates": sorted(saved_dates), "sectors": sorted(saved_sectors)}
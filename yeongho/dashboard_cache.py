@@ -0,0 +1,104 @@
+import os
+import json
+import threading
+from yeongho.rollups import get_rollups, invalidate_rollups
+
+KEYWORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "keywords.json")
+IMG_DIR = "yeongho/IMG"
+IMG_FOLDERS = ("sector", "keyword", "issue")
+
+
+class MtimeCache:
+    """
+    🗃️ 파일(또는 폴더)의 mtime 이 바뀔 때만 loader 를 다시 부르는 캐시
+
+    - 평소에는 stat 만 하고 파싱은 하지 않음
+    - 집계/차트 작업이 끝나면 invalidate() 로 바로 비울 수 있음
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    @staticmethod
+    def _version(paths) -> tuple:
+        version = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+
+    def get(self, *paths):
+        version = self._version(paths)
+        with self.lock:
+            entry = self.entries.get(paths)
+            if entry and entry[0] == version:
+                return entry[1]
+
+        value = self.loader(*paths)
+        with self.lock:
+            self.entries[paths] = (version, value)
+        return value
+
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def _load_json(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _scan_images(*folders) -> frozenset:
+    """IMG 하위 폴더의 이미지 목록 ("sector/xxx.png" 형태)"""
+    images = set()
+    for folder in folders:
+        if not os.path.isdir(folder):
+            continue
+        name = os.path.basename(folder)
+        images.update(f"{name}/{entry.name}" for entry in os.scandir(folder) if entry.name.endswith(".png"))
+    return frozenset(images)
+
+
+_keywords_cache = MtimeCache(_load_json)
+# 이미지는 os.replace 로 교체되므로 폴더 mtime 이 바뀜
+_images_cache = MtimeCache(_scan_images)
+
+
+def keywords_config() -> dict:
+    """config/keywords.json (섹터 → 키워드 목록)"""
+    return _keywords_cache.get(KEYWORDS_FILE)
+
+
+def sector_lists() -> tuple[list[str], list[str]]:
+    """(일반 섹터, 이슈 섹터) — 캐시된 집계에서 바로 꺼냄"""
+    names = get_rollups().sector_names
+    return (
+        [s for s in names if "_이슈" not in s and "_팀" not in s],
+        [s for s in names if "_이슈" in s],
+    )
+
+
+def image_manifest() -> frozenset:
+    return _images_cache.get(*(os.path.join(IMG_DIR, folder) for folder in IMG_FOLDERS))
+
+
+def existing_images(candidates) -> list:
+    """(라벨, 상대 경로) 중 실제로 만들어진 이미지만"""
+    manifest = image_manifest()
+    return [(label, path) for label, path in candidates if path in manifest]
+
+
+def invalidate(kind: str | None = None):
+    """작업이 끝난 뒤 호출 — "aggregate" 는 집계/섹터 목록, "charts" 는 이미지 목록, None 은 전부"""
+    if kind in (None, "aggregate"):
+        invalidate_rollups()
+    if kind in (None, "charts"):
+        _images_cache.invalidate()
+    if kind is None:
+        _keywords_cache.invalidate()
@@ -0,0 +1,202 @@
+import os
+import math
+import zlib
+import pickle
+import hashlib
+from collections import Counter
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+SIMILARITY_THRESHOLD = 0.85
+INDEX_DIR_NAME = ".index"
+# 저장 형식이 바뀌면 올려서 예전 인덱스 파일을 다시 만들게 함
+INDEX_FORMAT = 2
+
+# MinHash 서명 길이 = 밴드 수 × 밴드당 행 수
+# 행 5 × 밴드 32 → 단어 집합 자카드 0.7 인 쌍은 99.7%, 0.6 은 92% 를 후보로 잡고
+# 주제 단어 몇 개만 겹치는 0.2 이하는 1% 남짓만 잡음 (코사인 0.85 를 넘는 쌍은 대개 자카드 0.7 이상)
+LSH_BANDS = 32
+LSH_ROWS = 5
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20250630)
+_A = _rng.randint(1, _PRIME, size=LSH_BANDS * LSH_ROWS).astype(np.int64)
+_B = _rng.randint(0, _PRIME, size=LSH_BANDS * LSH_ROWS).astype(np.int64)
+
+# 기존 판정(기사마다 TfidfVectorizer 학습)과 같은 토큰 규칙
+_analyzer = TfidfVectorizer().build_analyzer()
+
+
+class Terms:
+    """문장 하나의 단어 빈도와 LSH 밴드 키"""
+
+    __slots__ = ("tf", "bands")
+
+    def __init__(self, tf: dict, bands: list):
+        self.tf = tf
+        self.bands = bands
+
+
+def minhash_bands(tokens) -> list:
+    """단어 집합 → 밴드별 키 (crc32 기반이라 프로세스가 달라도 같은 값)"""
+    if not tokens:
+        return []
+    x = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.int64, count=len(tokens))
+    signature = ((_A[:, None] * x[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+    return [signature[i * LSH_ROWS:(i + 1) * LSH_ROWS].tobytes() for i in range(LSH_BANDS)]
+
+
+def to_terms(cleaned: str) -> Terms:
+    tf = Counter(_analyzer(cleaned))
+    return Terms(dict(tf), minhash_bands(list(tf)))
+
+
+def iter_terms(cleaned_texts):
+    for cleaned in cleaned_texts:
+        yield to_terms(cleaned)
+
+
+class NearDuplicateIndex:
+    """
+    🧮 MinHash LSH 로 후보만 고르고, 후보와는 기존과 같은 TF-IDF 코사인으로 다시 확인하는 유사 기사 인덱스
+
+    - 완전히 같은 문장은 해시 집합으로 바로 판정
+    - IDF 는 기존 판정처럼 (저장된 문서 + 새 문서) 기준 — 문서 빈도(df)를 누적해 두어 다시 학습하지 않음
+    - 조회/추가는 밴드 수만큼의 dict 조회라 저장된 문서 수와 무관 (후보 수에만 비례)
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.hashes = set()
+        self.docs = []
+        self.df = Counter()
+        # 밴드 번호 → {밴드 키: [문서 번호, ...]}
+        self.buckets = [{} for _ in range(LSH_BANDS)]
+
+    def __len__(self):
+        return len(self.docs)
+
+    @staticmethod
+    def _digest(cleaned: str) -> str:
+        return hashlib.sha1(cleaned.encode("utf-8")).hexdigest()
+
+    def candidates(self, terms: Terms) -> set:
+        found = set()
+        for bucket, key in zip(self.buckets, terms.bands):
+            ids = bucket.get(key)
+            if ids:
+                found.update(ids)
+        return found
+
+    def similarities(self, terms: Terms) -> dict:
+        """후보 문서 번호 → TF-IDF 코사인 유사도 (새 문서를 포함한 말뭉치 기준 smooth IDF, L2 정규화)"""
+        n = len(self.docs) + 1
+
+        def idf(term):
+            df = self.df.get(term, 0) + (term in terms.tf)
+            return math.log((1 + n) / (1 + df)) + 1
+
+        weights = {term: count * idf(term) for term, count in terms.tf.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if not norm:
+            return {}
+
+        result = {}
+        for doc_id in self.candidates(terms):
+            doc = self.docs[doc_id]
+            dot, doc_norm = 0.0, 0.0
+            for term, count in doc.items():
+                w = count * idf(term)
+                doc_norm += w * w
+                if term in weights:
+                    dot += w * weights[term]
+            result[doc_id] = dot / (norm * math.sqrt(doc_norm)) if doc_norm else 0.0
+        return result
+
+    def is_duplicate(self, cleaned: str, terms: Terms = None) -> bool:
+        terms = to_terms(cleaned) if terms is None else terms
+        if not terms.tf:
+            # 단어가 없으면 TF-IDF 벡터가 0 이라 기존 판정도 유사하지 않음
+            return False
+        if self._digest(cleaned) in self.hashes:
+            return True
+        return any(s > self.threshold for s in self.similarities(terms).values())
+
+    def add(self, cleaned: str, terms: Terms = None):
+        terms = to_terms(cleaned) if terms is None else terms
+        doc_id = len(self.docs)
+        self.docs.append(terms.tf)
+        self.df.update(terms.tf.keys())
+        self.hashes.add(self._digest(cleaned))
+        for bucket, key in zip(self.buckets, terms.bands):
+            bucket.setdefault(key, []).append(doc_id)
+
+    def check_and_add(self, cleaned: str, terms: Terms = None) -> bool:
+        """유사 문서가 있으면 True, 없으면 인덱스에 추가하고 False"""
+        terms = to_terms(cleaned) if terms is None else terms
+        if self.is_duplicate(cleaned, terms):
+            return True
+        self.add(cleaned, terms)
+        return False
+
+
+class DayIndex:
+    """
+    📅 하루치 뉴스에 대한 (SECTOR, KEYWORD) 별 유사 기사 인덱스
+
+    - NewsData/.index/YYYYMMDD.pkl 에 저장
+    - 저장 당시의 원본 버전(기사 수)이나 저장 형식이 다르면 원본으로부터 다시 만듦
+    """
+
+    def __init__(self, path: str, version=None):
+        self.path = path
+        self.version = version
+        self.indexes = {}
+
+    def get(self, key) -> NearDuplicateIndex:
+        if key not in self.indexes:
+            self.indexes[key] = NearDuplicateIndex()
+        return self.indexes[key]
+
+    def save(self, version):
+        self.version = version
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((INDEX_FORMAT, self.version, self.indexes), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+
+def index_path(save_dir: str, date_str: str) -> str:
+    return os.path.join(save_dir, INDEX_DIR_NAME, f"{date_str}.pkl")
+
+
+def _read_index(path: str):
+    """(버전, 인덱스들) — 예전 형식이거나 읽을 수 없으면 None"""
+    try:
+        with open(path, "rb") as f:
+            stored = pickle.load(f)
+    except Exception:
+        return None
+    if len(stored) != 3 or stored[0] != INDEX_FORMAT:
+        return None
+    return stored[1], stored[2]
+
+
+def load_day_index(save_dir: str, date_str: str, version, load_existing=None, clean=None) -> DayIndex:
+    """저장된 인덱스를 읽고, 없거나 버전이 다르면 load_existing() 이 돌려준 기존 기사로 다시 만듦"""
+    path = index_path(save_dir, date_str)
+    stored = _read_index(path) if os.path.exists(path) else None
+    if stored and stored[0] == version:
+        day = DayIndex(path, version)
+        day.indexes = stored[1]
+        return day
+
+    day = DayIndex(path)
+    existing_df = load_existing() if load_existing else None
+    if existing_df is not None and not existing_df.empty:
+        for (sector, keyword), group in existing_df.groupby(["SECTOR", "KEYWORD"], sort=False):
+            index = day.get((sector, keyword))
+            cleaned = [clean(str(d)) for d in group["DESCRIPTION"].fillna("")]
+            for text, terms in zip(cleaned, iter_terms(cleaned)):
+                index.add(text, terms)
+    return day
@@ -4,15 +4,13 @@ from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from apscheduler.schedulers.background import BackgroundScheduler
-import requests
-import os
-import json
-import pandas as pd
+import asyncio
 
 # --- 내부 모듈 임포트 ---
-from yeongho.crawler import load_keywords, collect_google_news_by_keywords
-from yeongho.aggregate_news import aggregate_news_counts
-from yeongho.plot_chart import generate_sector_charts, generate_keyword_charts, generate_issue_charts
+from yeongho.correlation import LEVELS, news_return_correlation, top_pairs
+from yeongho.rollups import get_rollups
+from yeongho.dashboard_cache import keywords_config, sector_lists, existing_images
+from yeongho.pipeline import runner
 
 # --- FastAPI 앱 초기화 ---
 app = FastAPI()
@@ -35,11 +33,11 @@ templates = Jinja2Templates(directory="yeongho/templates")
 scheduler = BackgroundScheduler()
 
 def schedule_collect_news():
-    try:
-        res = requests.get("http://localhost:8000/collect-news")
-        print(f"📡 자동 뉴스 수집 호출 완료 - {res.status_code}")
-    except Exception as e:
-        print(f"❌ 자동 호출 실패: {e}")
+    # HTTP 로 자기 자신을 부르지 않고 같은 프로세스의 파이프라인(수집 → 집계 → 차트)을 바로 시작
+    if runner.submit("collect") is None:
+        print("⏭️ 이전 뉴스 수집이 아직 실행 중 — 이번 회차는 건너뜀")
+    else:
+        print("📡 자동 뉴스 수집 파이프라인 시작")
 
 for t in ["06:30", "10:00", "12:00", "15:00", "18:00", "21:00"]:
     hour, minute = map(int, t.split(":"))
@@ -47,27 +45,32 @@ for t in ["06:30", "10:00", "12:00", "15:00", "18:00", "21:00"]:
 
 scheduler.start()
 
+def already_running(job: str):
+    return JSONResponse(status_code=409, content={"status": "E", "error": f"'{job}' 작업이 이미 실행 중입니다."})
+
 # --------------------------------------------------
-# 📰 뉴스 수집 API
+# 📰 뉴스 수집 API (수집 → 집계 → 차트, 백그라운드 실행)
 # --------------------------------------------------
 @app.get("/collect-news")
 async def collect_news():
-    try:
-        keywords = load_keywords()
-        print(f"🔑 수집 대상 키워드 목록: {list(keywords.keys())}")
-        collect_google_news_by_keywords(keywords)
-        return JSONResponse(content={"status": "S", "message": "✅ 뉴스 수집 완료"})
-    except Exception as e:
-        return JSONResponse(status_code=500, content={"status": "E", "error": f"뉴스 수집 실패: {str(e)}"})
+    if runner.submit("collect") is None:
+        return already_running("collect")
+    return JSONResponse(status_code=202, content={
+        "status": "S",
+        "message": "✅ 뉴스 수집 시작 (진행 상황: /pipeline/status)",
+    })
 
 # --------------------------------------------------
 # 📊 뉴스 집계 API
 # --------------------------------------------------
 @app.get("/aggregate-news")
 async def aggregate_news():
+    future = runner.submit("aggregate")
+    if future is None:
+        return already_running("aggregate")
     try:
-        aggregate_news_counts()
-        return JSONResponse(content={"status": "S", "message": "✅ 뉴스 집계 완료"})
+        ctx = await asyncio.wrap_future(future)
+        return JSONResponse(content={"status": "S", "message": "✅ 뉴스 집계 완료", "changed_dates": ctx["changed_dates"]})
     except Exception as e:
         return JSONResponse(status_code=500, content={"status": "E", "error": f"집계 실패: {str(e)}"})
 
@@ -76,32 +79,78 @@ async def aggregate_news():
 # --------------------------------------------------
 @app.get("/generate-charts")
 async def generate_charts():
+    future = runner.submit("charts")
+    if future is None:
+        return already_running("charts")
     try:
-        generate_sector_charts()
-        generate_keyword_charts()
-        generate_issue_charts()
-        return JSONResponse(content={"status": "S", "message": "✅ 차트 생성 완료"})
+        ctx = await asyncio.wrap_future(future)
+        result = ctx["results"]["charts"]
+        return JSONResponse(content={
+            "status": "S",
+            "message": "✅ 차트 생성 완료",
+            "rendered": result["rendered"],
+            "skipped": result["skipped"],
+            "timings": result["timings"],
+        })
     except Exception as e:
         return JSONResponse(status_code=500, content={"status": "E", "error": f"차트 생성 실패: {str(e)}"})
 
+# --------------------------------------------------
+# 🧭 파이프라인 상태 API
+# --------------------------------------------------
+@app.get("/pipeline/status")
+def pipeline_status():
+    return JSONResponse(content={"status": "S", "jobs": runner.snapshot()})
+
+
+# --------------------------------------------------
+# 🔗 뉴스-수익률 상관 API
+# --------------------------------------------------
+@app.get("/correlation")
+def news_correlation(level: str = "sector", max_lag: int = 5, window: int = 60, top: int = 20):
+    if level not in LEVELS:
+        return JSONResponse(status_code=400, content={"status": "E", "error": f"알 수 없는 level: {level} ({' 또는 '.join(LEVELS)})"})
+    try:
+        result = news_return_correlation(level, max_lag, window)
+        return JSONResponse(content={"status": "S", "level": level, "pairs": top_pairs(result, top)})
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"status": "E", "error": f"상관 분석 실패: {str(e)}"})
+
+# --------------------------------------------------
+# 📉 기사 수 시계열 API (브라우저에서 차트를 그림)
+# --------------------------------------------------
+@app.get("/api/series/sector/{sector}")
+def sector_series(sector: str, format: str = "rows"):
+    try:
+        rollups = get_rollups()
+        if sector not in rollups.sector_names:
+            return JSONResponse(status_code=404, content={"status": "E", "error": f"섹터 없음: {sector}"})
+        series = rollups.sector_windows(sector, columnar=format == "columnar")
+        return JSONResponse(content={"status": "S", "sector": sector, "series": series})
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"status": "E", "error": f"시계열 조회 실패: {str(e)}"})
+
+
+@app.get("/api/series/keyword/{sector}")
+def keyword_series(sector: str, format: str = "rows"):
+    try:
+        keywords = keywords_config().get(sector)
+        rollups = get_rollups()
+        if keywords is None and sector not in rollups.sector_names:
+            return JSONResponse(status_code=404, content={"status": "E", "error": f"섹터 없음: {sector}"})
+        series = rollups.keyword_windows(sector, keywords, columnar=format == "columnar")
+        return JSONResponse(content={"status": "S", "sector": sector, "series": series})
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"status": "E", "error": f"시계열 조회 실패: {str(e)}"})
 
 # --------------------------------------------------
 # 🖼️ 대시보드 화면
 # --------------------------------------------------
 @app.get("/", response_class=HTMLResponse)
 def chart_index(request: Request):
-    # ✅ 키워드 로드
-    with open("yeongho/config/keywords.json", encoding="utf-8") as f:
-        keywords_data = json.load(f)
-    keyword_list = sorted(keywords_data.keys())
-
-    # ✅ 섹터 로드
-    sector_csv = pd.read_csv("yeongho/DATA/sector.csv")
-    all_sectors = sector_csv["SECTOR"].dropna().unique()
-
-    # ✅ 일반 섹터 / 이슈 섹터 분리
-    sector_list = sorted([s for s in all_sectors if "_이슈" not in s and "_팀" not in s])
-    sector_issue_list = sorted([s for s in all_sectors if "_이슈" in s])
+    # ✅ 키워드 / 섹터 목록은 캐시에서 (파일이 바뀌었거나 집계가 끝난 뒤에만 다시 읽음)
+    keyword_list = sorted(keywords_config().keys())
+    sector_list, sector_issue_list = sector_lists()
 
     return templates.TemplateResponse("chart_index.html", {
         "request": request,
@@ -111,57 +160,40 @@ def chart_index(request: Request):
     })
 
 
+# ✅ 시계열 API 의 구간 이름과 화면 제목
+SERIES_LABELS = [("1개월", "daily_1m"), ("3개월", "weekly_3m"), ("1년", "monthly_1y")]
+
+
 @app.get("/view/keyword/{keyword}", response_class=HTMLResponse)
 def view_keyword_chart(request: Request, keyword: str):
-    suffixes = [("1개월", "daily_1m"), ("3개월", "weekly_3m"), ("1년", "monthly_1y")]
-    images = []
-    for label, suffix in suffixes:
-        filename = f"{keyword}_keyword_{suffix}.png"
-        path = f"keyword/{filename}"  # ✅ 디렉토리 경로 추가
-        if os.path.exists(os.path.join("yeongho/IMG", path)):
-            images.append((label, path))
     return templates.TemplateResponse("chart_detail.html", {
         "request": request,
         "title": keyword,
-        "images": images
+        "images": [],
+        "series_url": f"/api/series/keyword/{keyword}?format=columnar",
+        "series_labels": SERIES_LABELS,
     })
 
 
 @app.get("/view/sector/{sector}", response_class=HTMLResponse)
 def view_sector_chart(request: Request, sector: str):
-    suffixes = [("1개월", "daily_1m"), ("3개월", "weekly_3m"), ("1년", "monthly_1y")]
-    images = []
-
-    # ✅ 이슈 섹터는 issue 디렉토리에서 검색
     if "_이슈" in sector:
-        folder = "issue"
         title = f"{sector.replace('_이슈', '')} 이슈"
     else:
-        folder = "sector"
         title = f"{sector} 섹터"
 
-    for label, suffix in suffixes:
-        filename = f"{sector}_{suffix}.png"
-        path = f"{folder}/{filename}"
-        if os.path.exists(os.path.join("yeongho/IMG", path)):
-            images.append((label, path))
-
     return templates.TemplateResponse("chart_detail.html", {
         "request": request,
         "title": title,
-        "images": images
+        "images": [],
+        "series_url": f"/api/series/sector/{sector}?format=columnar",
+        "series_labels": SERIES_LABELS,
     })
 
 
 @app.get("/view/sector", response_class=HTMLResponse)
 def view_total_sector_chart(request: Request):
-    suffixes = [("1개월", "daily_1m"), ("3개월", "weekly_3m"), ("1년", "monthly_1y")]
-    images = []
-    for label, suffix in suffixes:
-        filename = f"sector_{suffix}.png"
-        path = f"sector/{filename}"  # ✅ 디렉토리 경로 추가
-        if os.path.exists(os.path.join("yeongho/IMG", path)):
-            images.append((label, path))
+    images = existing_images((label, f"sector/sector_{suffix}.png") for label, suffix in SERIES_LABELS)
     return templates.TemplateResponse("chart_detail.html", {
         "request": request,
         "title": "전체 섹터",
@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import pandas as pd
+
+NEWS_DB_FILE = "news.db"
+# 날짜별 CSV 와 같은 컬럼 순서 (DB 컬럼은 소문자)
+CSV_COLUMNS = ["SECTOR", "KEYWORD", "MEDIA", "TITLE", "DESCRIPTION", "URL", "PUBLISHED", "SCRAPED_AT"]
+DB_COLUMNS = [c.lower() for c in CSV_COLUMNS]
+QUERY_CHUNK_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    sector TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    media TEXT,
+    title TEXT,
+    description TEXT,
+    url TEXT NOT NULL,
+    published TEXT,
+    scraped_at TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_news_url ON news(url);
+CREATE INDEX IF NOT EXISTS ix_news_date_sector_keyword ON news(date, sector, keyword);
+"""
+
+
+class NewsStore:
+    """
+    🗄️ 뉴스 기사 저장소 (SQLite)
+
+    - URL 유니크 인덱스로 날짜와 상관없이 중복 확인
+    - 기사는 배치로 추가만 하고 기존 행은 다시 쓰지 않음
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def existing_urls(self, urls) -> set:
+        urls = list(set(urls))
+        found = set()
+        for i in range(0, len(urls), QUERY_CHUNK_SIZE):
+            chunk = urls[i:i + QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(url for (url,) in self.conn.execute(f"SELECT url FROM news WHERE url IN ({placeholders})", chunk))
+        return found
+
+    def insert_articles(self, date_str: str, articles: list[dict]) -> int:
+        """기사 행(CSV 컬럼 dict)을 한 번에 추가 — 이미 있는 URL 은 무시"""
+        placeholders = ",".join("?" * (len(DB_COLUMNS) + 1))
+        with self.conn:
+            cursor = self.conn.executemany(
+                f"INSERT OR IGNORE INTO news (date, {', '.join(DB_COLUMNS)}) VALUES ({placeholders})",
+                ([date_str, *(a.get(c) for c in CSV_COLUMNS)] for a in articles),
+            )
+        return cursor.rowcount
+
+    def count_day(self, date_str: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM news WHERE date = ?", (date_str,)).fetchone()[0]
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM news LIMIT 1").fetchone() is None
+
+    def day_frame(self, date_str: str) -> pd.DataFrame:
+        """하루치 기사 (CSV 와 같은 컬럼)"""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(DB_COLUMNS)} FROM news WHERE date = ? ORDER BY id", (date_str,)
+        ).fetchall()
+        return pd.DataFrame(rows, columns=CSV_COLUMNS)
+
+    def import_csv_dir(self, news_dir: str) -> int:
+        """기존 날짜별 CSV(YYYYMMDD.csv) 를 모두 가져옴 — 이미 있는 URL 은 건너뜀"""
+        imported = 0
+        for filename in sorted(f for f in os.listdir(news_dir) if f.endswith(".csv")):
+            df = pd.read_csv(os.path.join(news_dir, filename), dtype=str, keep_default_na=False)
+            df = df.reindex(columns=CSV_COLUMNS, fill_value="")
+            imported += self.insert_articles(filename[:-4], df.to_dict("records"))
+        print(f"📥 기존 CSV 가져오기 완료: {imported}건")
+        return imported
+
+    def export_day_csv(self, date_str: str, save_dir: str) -> str:
+        """DB 기준으로 하루치 CSV 를 다시 씀 (CSV 가 손상됐거나 새로 만들 때)"""
+        path = os.path.join(save_dir, f"{date_str}.csv")
+        tmp_path = f"{path}.tmp"
+        self.day_frame(date_str).to_csv(tmp_path, index=False, encoding="utf-8-sig")
+        os.replace(tmp_path, path)
+        return path
+
+
+def open_store(save_dir: str) -> NewsStore:
+    """save_dir/news.db 를 열고, 비어 있으면 그 폴더의 기존 CSV 를 먼저 가져옴"""
+    store = NewsStore(os.path.join(save_dir, NEWS_DB_FILE))
+    if store.is_empty() and any(f.endswith(".csv") for f in os.listdir(save_dir)):
+        store.import_csv_dir(save_dir)
+    return store
+
+
+def append_day_csv(save_dir: str, date_str: str, articles: list[dict]) -> str:
+    """기존 CSV 를 읽지 않고 새 기사만 끝에 덧붙임 (CSV 를 읽는 집계/차트 쪽 호환용)"""
+    path = os.path.join(save_dir, f"{date_str}.csv")
+    pd.DataFrame(articles, columns=CSV_COLUMNS).to_csv(
+        path, mode="a", index=False, header=not os.path.exists(path), encoding="utf-8-sig"
+    )
+    return path
+
+
+if __name__ == "__main__":
+    with open_store("yeongho/NewsData") as news_store:
+        print(f"🗄️ 저장된 기사 수: {news_store.conn.execute('SELECT COUNT(*) FROM news').fetchone()[0]}")
@@ -0,0 +1,135 @@
+import os
+import time
+import threading
+from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from yeongho.crawler import load_keywords, collect_google_news_by_keywords
+from yeongho.aggregate_news import aggregate_news_counts
+from yeongho.plot_chart import generate_sector_charts, generate_keyword_charts, generate_issue_charts
+from yeongho.dashboard_cache import invalidate
+
+# 작업 종류별 실행 단계 (앞 단계 결과를 ctx 로 넘겨받음)
+PIPELINES = {
+    "collect": ["collect", "aggregate", "charts"],
+    "aggregate": ["aggregate"],
+    "charts": ["charts"],
+}
+
+
+def run_collect(ctx: dict) -> dict:
+    crawl = collect_google_news_by_keywords(load_keywords())
+    ctx["crawl"] = crawl
+    return {"fetched": crawl["fetched"], "dates": len(crawl["dates"]), "sectors": crawl["sectors"]}
+
+
+def run_aggregate(ctx: dict) -> dict:
+    changed_dates = aggregate_news_counts()
+    invalidate("aggregate")
+    ctx["changed_dates"] = changed_dates
+    return {"changed_dates": changed_dates}
+
+
+def _chart_sectors(ctx: dict):
+    """다시 그릴 섹터 — None 은 전체, 빈 목록은 건너뜀"""
+    crawl = ctx.get("crawl")
+    if crawl is None or ctx.get("full_charts"):
+        return None
+    # 수집하지 않은 날짜까지 집계가 바뀌었으면 어느 섹터인지 모르므로 전체
+    if set(ctx.get("changed_dates", [])) - set(crawl["dates"]):
+        return None
+    return crawl["sectors"] if ctx.get("changed_dates") else []
+
+
+def run_charts(ctx: dict) -> dict:
+    sectors = _chart_sectors(ctx)
+    if sectors == []:
+        return {"skipped": True, "reason": "바뀐 집계 없음"}
+
+    results = (
+        generate_sector_charts(sectors=sectors)
+        + generate_keyword_charts(sectors=sectors)
+        + generate_issue_charts(sectors=sectors)
+    )
+    invalidate("charts")
+    return {
+        "sectors": "all" if sectors is None else sectors,
+        "rendered": sum(r["status"] == "rendered" for r in results),
+        "skipped": sum(r["status"] == "skipped" for r in results),
+        "timings": {os.path.basename(r["path"]): r["seconds"] for r in results if r["status"] == "rendered"},
+    }
+
+
+STAGES = {"collect": run_collect, "aggregate": run_aggregate, "charts": run_charts}
+
+
+class PipelineRunner:
+    """
+    🏃 수집 → 집계 → 차트 작업을 이벤트 루프 밖의 스레드에서 실행합니다.
+
+    - 같은 종류의 작업은 한 번에 하나만 (이미 실행 중이면 submit 이 None 반환)
+    - 단계(수집/집계/차트)별 잠금으로 다른 종류 작업과도 같은 파일을 동시에 쓰지 않음
+    - 하루의 첫 차트 단계는 기간 구간이 밀리므로 전체 섹터를 다시 그림
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline")
+        self.job_locks = {job: threading.Lock() for job in PIPELINES}
+        self.stage_locks = {stage: threading.Lock() for stage in STAGES}
+        self.status_lock = threading.Lock()
+        self.status = {job: {"state": "idle"} for job in PIPELINES}
+        self.last_chart_day = None
+
+    def submit(self, job: str):
+        """작업을 백그라운드로 시작 — 같은 작업이 실행 중이면 None"""
+        if not self.job_locks[job].acquire(blocking=False):
+            return None
+        try:
+            return self.executor.submit(self._run, job)
+        except Exception:
+            self.job_locks[job].release()
+            raise
+
+    def _set_status(self, job: str, **fields):
+        with self.status_lock:
+            self.status[job].update(fields)
+
+    def _run(self, job: str) -> dict:
+        ctx = {"results": {}}
+        started = time.perf_counter()
+        self._set_status(job, state="running", started_at=datetime.now().isoformat(timespec="seconds"),
+                         finished_at=None, error=None, stages={})
+        try:
+            for stage in PIPELINES[job]:
+                if stage == "charts":
+                    ctx["full_charts"] = self.last_chart_day != date.today()
+                stage_started = time.perf_counter()
+                with self.stage_locks[stage]:
+                    result = ctx["results"][stage] = STAGES[stage](ctx)
+                if stage == "charts" and ctx["full_charts"] and not result.get("skipped"):
+                    self.last_chart_day = date.today()
+                with self.status_lock:
+                    self.status[job]["stages"][stage] = {
+                        "seconds": round(time.perf_counter() - stage_started, 3),
+                        "result": result,
+                    }
+            self._set_status(job, state="done")
+            return ctx
+        except Exception as e:
+            print(f"❌ 파이프라인 '{job}' 실패: {e}")
+            self._set_status(job, state="failed", error=str(e))
+            raise
+        finally:
+            self._set_status(job, finished_at=datetime.now().isoformat(timespec="seconds"),
+                             seconds=round(time.perf_counter() - started, 3))
+            self.job_locks[job].release()
+
+    def snapshot(self) -> dict:
+        with self.status_lock:
+            return {
+                job: {**status, "stages": dict(status.get("stages", {}))}
+                for job, status in self.status.items()
+            }
+
+
+runner = PipelineRunner()
@@ -1,11 +1,18 @@
 import os
 import json
+import time
+import hashlib
+import multiprocessing
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")  # 서버/워커 프로세스에서 창 없이 렌더링
 import matplotlib.pyplot as plt
 from matplotlib import font_manager, rc
 from matplotlib.ticker import MaxNLocator
 import matplotlib as mpl
 import seaborn as sns
+from yeongho.rollups import get_rollups, period_label, window_start
 
 # ✅ 폰트 설정
 import matplotlib as mpl
@@ -26,10 +33,23 @@ plt.style.use("seaborn-v0_8-muted")
 
 # ✅ 공통 차트 구성 설정 (기존 코드 유지)
 CHART_CONFIGS = [
-    {"label": "1년 월간", "offset": pd.DateOffset(years=1), "group_fn": lambda d: d.dt.to_period("M").astype(str), "suffix": "monthly_1y", "xlabel": "월"},
-    {"label": "3개월 주간", "offset": pd.DateOffset(months=3), "group_fn": lambda d: d.dt.to_period("W").astype(str), "suffix": "weekly_3m", "xlabel": "주"},
-    {"label": "1개월 일간", "offset": pd.DateOffset(months=1), "group_fn": lambda d: d.dt.strftime("%Y-%m-%d"), "suffix": "daily_1m", "xlabel": "날짜"}
+    {"label": "1년 월간", "offset": pd.DateOffset(years=1), "grain": "month", "suffix": "monthly_1y", "xlabel": "월"},
+    {"label": "3개월 주간", "offset": pd.DateOffset(months=3), "grain": "week", "suffix": "weekly_3m", "xlabel": "주"},
+    {"label": "1개월 일간", "offset": pd.DateOffset(months=1), "grain": "day", "suffix": "daily_1m", "xlabel": "날짜"}
 ]
+CHART_DPI = 300
+# 차트 모양(save_line_chart)을 바꾸면 올려서 기존 이미지를 모두 다시 그리게 함
+CHART_STYLE_VERSION = 1
+MANIFEST_FILE = ".chart_manifest.json"
+
+
+def _with_labels(frame, grain):
+    """정수 기간 키 인덱스 → 축 라벨(GROUP)"""
+    frame = frame.copy()
+    frame.index = pd.Index([period_label(k, grain) for k in frame.index], name="GROUP")
+    return frame
+
+
 def save_line_chart(pivot_df, title, xlabel, legend_title, save_path):
     if pivot_df.empty:
         return False
@@ -94,101 +114,165 @@ def save_line_chart(pivot_df, title, xlabel, legend_title, save_path):
         ax.legend(title=legend_title, bbox_to_anchor=(1.01, 1), loc='upper left', fontsize=9, frameon=False)
 
     plt.tight_layout(rect=[0, 0, 0.9, 1])
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    # 읽는 쪽(대시보드)이 반쯤 쓰인 이미지를 보지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f"{save_path}.tmp"
+    plt.savefig(tmp_path, dpi=CHART_DPI, bbox_inches='tight', format="png")
+    plt.close(fig)
+    os.replace(tmp_path, save_path)
     return True
 
 
+def chart_hash(pivot_df, title, xlabel, legend_title) -> str:
+    """차트 데이터 + 제목/축 + 스타일 버전의 해시 — 같으면 이미지도 같음"""
+    raw = json.dumps([CHART_STYLE_VERSION, CHART_DPI, title, xlabel, legend_title], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8") + pivot_df.to_csv().encode("utf-8")).hexdigest()
+
+
+def _render_job(job) -> tuple[str, bool, float]:
+    started = time.perf_counter()
+    saved = save_line_chart(*job)
+    return job[-1], saved, time.perf_counter() - started
+
+
+def _load_manifest(output_dir: str) -> dict:
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(output_dir: str, manifest: dict):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(f"{path}.tmp", path)
+
+
+def render_charts(jobs, output_dir: str, workers=None) -> list[dict]:
+    """
+    🖼️ (pivot_df, title, xlabel, legend_title, save_path) 목록을 렌더링합니다.
+
+    - 데이터/스타일 해시가 지난번과 같고 파일이 있으면 건너뜀
+    - 바뀐 차트가 여러 개면 프로세스 풀에 나눠 그림
+    - 반환: [{"path", "status": rendered|skipped|empty, "seconds"}]
+    """
+    manifest = _load_manifest(output_dir)
+    results, pending, hashes = [], [], {}
+    for job in jobs:
+        save_path = job[-1]
+        name = os.path.basename(save_path)
+        if job[0].empty:
+            results.append({"path": save_path, "status": "empty", "seconds": 0.0})
+            continue
+        hashes[name] = chart_hash(*job[:-1])
+        if manifest.get(name) == hashes[name] and os.path.exists(save_path):
+            results.append({"path": save_path, "status": "skipped", "seconds": 0.0})
+        else:
+            pending.append(job)
+
+    if len(pending) > 1 and workers != 1:
+        # 대시보드의 파이프라인 스레드에서 호출되므로 fork 대신 spawn (다른 스레드가 쥔 잠금을 물려받지 않음)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            rendered = list(executor.map(_render_job, pending))
+    else:
+        rendered = [_render_job(job) for job in pending]
+
+    for save_path, saved, seconds in rendered:
+        name = os.path.basename(save_path)
+        if saved:
+            manifest[name] = hashes[name]
+            print(f"✅ 저장 완료: {save_path} ({seconds:.2f}s)")
+        else:
+            manifest.pop(name, None)
+        results.append({"path": save_path, "status": "rendered" if saved else "empty", "seconds": round(seconds, 3)})
+
+    _save_manifest(output_dir, manifest)
+    skipped = sum(r["status"] == "skipped" for r in results)
+    print(f"🖼️ {output_dir}: 렌더링 {len(rendered)}개 / 변경 없음 {skipped}개")
+    return results
+
 
-def generate_sector_charts(data_path="yeongho/DATA", output_dir="yeongho/IMG/sector"):
-    """📊 일반 섹터별 기사 수 합계 차트 생성"""
+
+def generate_sector_charts(data_path="yeongho/DATA", output_dir="yeongho/IMG/sector", sectors=None, workers=None):
+    """📊 일반 섹터별 기사 수 합계 차트 생성 (sectors 를 주면 그 섹터만)"""
+    jobs = []
     try:
         os.makedirs(output_dir, exist_ok=True)
-        df = pd.read_csv(os.path.join(data_path, "sector.csv"))
-        df["DATE"] = pd.to_datetime(df["DATE"], format="%Y%m%d")
-        today = pd.to_datetime("today")
+        rollups = get_rollups(data_path)
 
-        sectors = [s for s in df["SECTOR"].unique() if "_이슈" not in s and "_팀" not in s]
+        targets = [s for s in rollups.sector_names if "_이슈" not in s and "_팀" not in s]
+        if sectors is not None:
+            targets = [s for s in targets if s in sectors]
 
-        for sector in sectors:
-            sector_df = df[df["SECTOR"] == sector]
+        for sector in targets:
             for config in CHART_CONFIGS:
-                filtered = sector_df[sector_df["DATE"] >= today - config["offset"]].copy()
-                filtered["GROUP"] = config["group_fn"](filtered["DATE"])
-                pivot_df = filtered.groupby("GROUP")["CNT"].sum().reset_index().set_index("GROUP")
+                series = rollups.sector_series(sector, config["grain"], window_start(config["offset"]))
+                pivot_df = _with_labels(series.to_frame("CNT"), config["grain"])
 
                 chart_title = f"{sector} - {config['label']} 기사 수 추이"
                 file_name = f"{sector}_{config['suffix']}.png"
                 save_path = os.path.join(output_dir, file_name)
+                jobs.append((pivot_df, chart_title, config["xlabel"], "기사 수", save_path))
 
-                if save_line_chart(pivot_df, chart_title, config["xlabel"], "기사 수", save_path):
-                    print(f"✅ 저장 완료: {save_path}")
+        return render_charts(jobs, output_dir, workers)
     except Exception as e:
         print(f"❌ 섹터 차트 생성 실패: {e}")
+        return []
 
 
-
-
-
-def generate_keyword_charts(data_path="yeongho/DATA", output_dir="yeongho/IMG/keyword", keywords_file="yeongho/config/keywords.json"):
-    """🔍 섹터별 키워드 기사 수 비교 차트"""
+def generate_keyword_charts(data_path="yeongho/DATA", output_dir="yeongho/IMG/keyword", keywords_file="yeongho/config/keywords.json", sectors=None, workers=None):
+    """🔍 섹터별 키워드 기사 수 비교 차트 (sectors 를 주면 그 섹터만)"""
+    jobs = []
     try:
         os.makedirs(output_dir, exist_ok=True)
         with open(keywords_file, encoding="utf-8") as f:
             keyword_mapping = json.load(f)
 
-        df = pd.read_csv(os.path.join(data_path, "keyword.csv"))
-        df["날짜"] = pd.to_datetime(df["DATE"], format="%Y%m%d")
-        today = pd.to_datetime("today")
-        
+        rollups = get_rollups(data_path)
+
         for sector, keywords in keyword_mapping.items():
-            sector_df = df[(df["SECTOR"] == sector) & (df["KEYWORD"].isin(keywords))]
+            if sectors is not None and sector not in sectors:
+                continue
 
             for config in CHART_CONFIGS:
-                filtered = sector_df[sector_df["날짜"] >= today - config["offset"]].copy()
-                filtered["GROUP"] = config["group_fn"](filtered["날짜"])
-                pivot_df = filtered.pivot_table(index="GROUP", columns="KEYWORD", values="CNT", aggfunc="sum").fillna(0)
+                frame = rollups.keyword_frame(sector, config["grain"], window_start(config["offset"]), keywords)
+                pivot_df = _with_labels(frame, config["grain"])
 
                 file_name = f"{sector}_keyword_{config['suffix']}.png"
                 save_path = os.path.join(output_dir, file_name)
+                jobs.append((pivot_df, f"{sector} - {config['label']} 키워드별 기사 수", config["xlabel"], "키워드", save_path))
 
-                if save_line_chart(pivot_df, f"{sector} - {config['label']} 키워드별 기사 수", config["xlabel"], "키워드", save_path):
-                    print(f"✅ 저장 완료: {save_path}")
+        return render_charts(jobs, output_dir, workers)
     except Exception as e:
         print(f"❌ 키워드 차트 생성 실패: {e}")
+        return []
 
 
 
-def generate_issue_charts(data_path="yeongho/DATA", output_dir="yeongho/IMG/issue"):
-    """🧩 이슈 섹터별 '총 기사 수' 추이 선그래프 생성"""
+def generate_issue_charts(data_path="yeongho/DATA", output_dir="yeongho/IMG/issue", sectors=None, workers=None):
+    """🧩 이슈 섹터별 '총 기사 수' 추이 선그래프 생성 (sectors 를 주면 그 섹터만)"""
+    jobs = []
     try:
         os.makedirs(output_dir, exist_ok=True)
-        df = pd.read_csv(os.path.join(data_path, "sector.csv"))
-        df["DATE"] = pd.to_datetime(df["DATE"], format="%Y%m%d")
-        today = pd.to_datetime("today")
+        rollups = get_rollups(data_path)
 
-        issue_sectors = [s for s in df["SECTOR"].unique() if "_이슈" in s]
+        issue_sectors = [s for s in rollups.sector_names if "_이슈" in s]
+        if sectors is not None:
+            issue_sectors = [s for s in issue_sectors if s in sectors]
 
         for sector in issue_sectors:
-            sector_df = df[df["SECTOR"] == sector]
-
             for config in CHART_CONFIGS:
-                filtered = sector_df[sector_df["DATE"] >= today - config["offset"]].copy()
-                filtered["GROUP"] = config["group_fn"](filtered["DATE"])
-                pivot_df = (
-                    filtered.groupby("GROUP")["CNT"]
-                    .sum()
-                    .reset_index()
-                    .set_index("GROUP")
-                )
+                series = rollups.sector_series(sector, config["grain"], window_start(config["offset"]))
+                pivot_df = _with_labels(series.to_frame("CNT"), config["grain"])
 
                 chart_title = f"{sector.replace('_이슈','')} - {config['label']} 이슈 기사 수 추이"
                 file_name = f"{sector}_{config['suffix']}.png"
                 save_path = os.path.join(output_dir, file_name)
+                jobs.append((pivot_df, chart_title, config["xlabel"], "기사 수", save_path))
 
-                if save_line_chart(pivot_df, chart_title, config["xlabel"], "기사 수", save_path):
-                    print(f"✅ 저장 완료: {save_path}")
-
+        return render_charts(jobs, output_dir, workers)
     except Exception as e:
         print(f"❌ 이슈 차트 생성 실패: {e}")
+        return []
 
@@ -0,0 +1,183 @@
+import os
+import threading
+from datetime import date, timedelta
+import pandas as pd
+
+DATA_DIR = "yeongho/DATA"
+GRAINS = ("day", "week", "month")
+# 대시보드 기본 구간: (이름, 단위, 기간)
+SERIES_WINDOWS = [
+    ("daily_1m", "day", pd.DateOffset(months=1)),
+    ("weekly_3m", "week", pd.DateOffset(months=3)),
+    ("monthly_1y", "month", pd.DateOffset(years=1)),
+]
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def period_keys(dates: pd.Series) -> dict[str, pd.Series]:
+    """날짜 → 정수 기간 키 (일: YYYYMMDD, ISO 주: YYYYWW, 월: YYYYMM)"""
+    iso = dates.dt.isocalendar()
+    return {
+        "day": dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day,
+        "week": iso["year"].astype("int64") * 100 + iso["week"].astype("int64"),
+        "month": dates.dt.year * 100 + dates.dt.month,
+    }
+
+
+def period_key(date, grain: str) -> int:
+    return int(period_keys(pd.Series([pd.Timestamp(date)]))[grain].iloc[0])
+
+
+def period_label(key: int, grain: str) -> str:
+    """기간 키 → 차트/API 라벨 (기존 대시보드와 같은 형식: 2025-06-30, 2025-06-23/2025-06-29, 2025-06)"""
+    if grain == "day":
+        return f"{key // 10000}-{key // 100 % 100:02d}-{key % 100:02d}"
+    if grain == "week":
+        monday = date.fromisocalendar(key // 100, key % 100, 1)
+        return f"{monday}/{monday + timedelta(days=6)}"
+    return f"{key // 100}-{key % 100:02d}"
+
+
+def _day_to_period(day_keys, grain: str):
+    dates = pd.to_datetime(pd.Series(day_keys).astype(str), format="%Y%m%d")
+    return period_keys(dates)[grain].to_numpy()
+
+
+def window_start(offset, today=None) -> pd.Timestamp:
+    """구간의 첫 날 — 기존 차트처럼 (지금 - 기간) 이후의 날짜만 포함"""
+    now = pd.Timestamp.today() if today is None else pd.Timestamp(today)
+    return (now - offset).ceil("D")
+
+
+def to_json_series(frame: pd.DataFrame, grain: str, columnar: bool = False) -> dict:
+    """
+    기간 키 인덱스 프레임 → JSON 용 dict
+
+    - 기본: {"columns": ["period", ...], "rows": [[라벨, 값, ...], ...]}
+    - columnar: {"period": [...], 컬럼: [...], ...}
+    """
+    labels = [period_label(int(k), grain) for k in frame.index]
+    values = {str(c): frame[c].astype(int).tolist() for c in frame.columns}
+    if columnar:
+        return {"grain": grain, "period": labels, **values}
+    return {
+        "grain": grain,
+        "columns": ["period", *values],
+        "rows": [list(row) for row in zip(labels, *values.values())],
+    }
+
+
+def rollup(df: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+    """
+    📚 일/주/월 집계를 groupby 한 번으로 계산합니다.
+
+    - 입력: DATE(YYYYMMDD), by 컬럼들, CNT
+    - 반환: (GRAIN, *by, PERIOD) 인덱스의 CNT 프레임
+    """
+    dates = pd.to_datetime(df["DATE"].astype(str), format="%Y%m%d")
+    keys = period_keys(dates)
+    # 세 단위를 세로로 쌓아 한 번에 묶음
+    stacked = pd.concat(
+        [df[by + ["CNT"]].assign(GRAIN=grain, PERIOD=keys[grain].to_numpy()) for grain in GRAINS],
+        ignore_index=True,
+    )
+    return stacked.groupby(["GRAIN", *by, "PERIOD"], sort=True)["CNT"].sum().to_frame()
+
+
+class Rollups:
+    """섹터/이슈 섹터(sector.csv) 와 섹터·키워드(keyword.csv) 의 일/주/월 집계"""
+
+    def __init__(self, sector_df: pd.DataFrame, keyword_df: pd.DataFrame):
+        self.sectors = rollup(sector_df, ["SECTOR"])
+        self.keywords = rollup(keyword_df, ["SECTOR", "KEYWORD"])
+        self.sector_names = sorted(sector_df["SECTOR"].dropna().unique())
+
+    @staticmethod
+    def _slice(table: pd.DataFrame, loc: tuple) -> pd.Series:
+        try:
+            return table.loc[loc, "CNT"]
+        except KeyError:
+            return pd.Series(dtype="int64", name="CNT")
+
+    def _window(self, table: pd.DataFrame, key: tuple, grain: str, since=None) -> pd.Series:
+        """
+        (…, PERIOD) → 기사 수 중 since 이후
+
+        - 온전한 주/월은 미리 집계한 값을 그대로 쓰고, since 가 걸친 첫 주/월만 일 집계에서 since 이후 날짜를 다시 합산
+        """
+        series = self._slice(table, (grain, *key))
+        if since is None or series.empty:
+            return series
+        first = period_key(since, grain)
+        periods = series.index.get_level_values("PERIOD")
+        if grain == "day":
+            return series[periods >= first]
+        rest = series[periods > first]
+
+        days = self._slice(table, ("day", *key))
+        days = days[days.index.get_level_values("PERIOD") >= period_key(since, "day")]
+        day_periods = _day_to_period(days.index.get_level_values("PERIOD"), grain)
+        head = days[day_periods == first]
+        # PERIOD 외의 레벨(키워드)은 그대로 두고 첫 기간으로 합침
+        levels = [head.index.get_level_values(name) for name in head.index.names if name != "PERIOD"]
+        head = head.groupby([*levels, [first] * len(head)]).sum()
+        head.index.names = rest.index.names
+        return pd.concat([head, rest]).sort_index()
+
+    def sector_series(self, sector: str, grain: str, since=None) -> pd.Series:
+        """기간 키 → 기사 수 (since 이후 날짜만)"""
+        return self._window(self.sectors, (sector,), grain, since)
+
+    def keyword_frame(self, sector: str, grain: str, since=None, keywords=None) -> pd.DataFrame:
+        """기간 키 × 키워드 기사 수 (since 이후 날짜만, 없는 칸은 0)"""
+        series = self._window(self.keywords, (sector,), grain, since)
+        if series.empty:
+            return pd.DataFrame()
+        frame = series.unstack("KEYWORD", fill_value=0)
+        if keywords is not None:
+            frame = frame.loc[:, [k for k in frame.columns if k in keywords]]
+        # 해당 기간에 선택한 키워드 기사가 하나도 없는 행은 뺌
+        return frame[frame.sum(axis=1) > 0] if len(frame.columns) else frame.iloc[0:0]
+
+    def sector_windows(self, sector: str, columnar: bool = False, today=None) -> dict:
+        """섹터 기사 수의 1개월 일간 / 3개월 주간 / 1년 월간 시계열"""
+        return {
+            name: to_json_series(self.sector_series(sector, grain, window_start(offset, today)).to_frame("CNT"), grain, columnar)
+            for name, grain, offset in SERIES_WINDOWS
+        }
+
+    def keyword_windows(self, sector: str, keywords=None, columnar: bool = False, today=None) -> dict:
+        """섹터 안 키워드별 기사 수의 1개월 일간 / 3개월 주간 / 1년 월간 시계열"""
+        return {
+            name: to_json_series(self.keyword_frame(sector, grain, window_start(offset, today), keywords), grain, columnar)
+            for name, grain, offset in SERIES_WINDOWS
+        }
+
+
+def _version(paths) -> tuple:
+    return tuple((p, os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths)
+
+
+def get_rollups(data_path: str = DATA_DIR) -> Rollups:
+    """집계 CSV 가 바뀌지 않았으면 캐시된 Rollups 반환"""
+    paths = [os.path.join(data_path, "sector.csv"), os.path.join(data_path, "keyword.csv")]
+    version = _version(paths)
+    with _cache_lock:
+        cached = _cache.get(data_path)
+        if cached and cached[0] == version:
+            return cached[1]
+
+    rollups = Rollups(pd.read_csv(paths[0], dtype={"DATE": str}), pd.read_csv(paths[1], dtype={"DATE": str}))
+    with _cache_lock:
+        _cache[data_path] = (version, rollups)
+    return rollups
+
+
+def invalidate_rollups(data_path: str | None = None):
+    with _cache_lock:
+        if data_path is None:
+            _cache.clear()
+        else:
+            _cache.pop(data_path, None)
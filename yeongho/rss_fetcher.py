@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+import feedparser
+import httpx
+
+# 로컬 테스트용 RSS 서버로 바꿔 끼울 수 있도록 환경변수로 설정
+RSS_BASE_URL = os.getenv("NEWS_RSS_URL", "https://news.google.com/rss/search")
+RSS_PARAMS = {"hl": "ko", "gl": "KR", "ceid": "KR:ko"}
+RSS_STATE_FILE = ".rss_state.json"
+DEFAULT_CONCURRENCY = 5
+# 키워드별로 기억할 최근 URL 수 (RSS 는 보통 100건 안팎)
+MAX_SEEN_URLS = 1000
+
+
+def _state_key(sector: str, keyword: str) -> str:
+    return f"{sector}/{keyword}"
+
+
+def load_state(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state: dict, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def mark_seen(state: dict, sector: str, keyword: str, urls):
+    """저장까지 끝난 기사 URL 을 상태에 기록 (오래된 것부터 버림)"""
+    entry = state.setdefault(_state_key(sector, keyword), {})
+    seen = entry.get("seen", [])
+    seen_set = set(seen)
+    seen.extend(url for url in urls if url not in seen_set)
+    entry["seen"] = seen[-MAX_SEEN_URLS:]
+
+
+async def fetch_feed(client: httpx.AsyncClient, sector: str, keyword: str, state: dict) -> dict:
+    """
+    📡 키워드 RSS 한 건을 조건부 GET 으로 받아 처음 보는 기사만 반환합니다.
+
+    - 304 (변경 없음) 이면 entries 는 빈 목록
+    - 반환: {"sector", "keyword", "status", "entries", "skipped", "etag", "last_modified"}
+    """
+    cached = state.get(_state_key(sector, keyword), {})
+    headers = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    res = await client.get(RSS_BASE_URL, params={"q": keyword, **RSS_PARAMS}, headers=headers)
+    result = {"sector": sector, "keyword": keyword, "status": res.status_code, "entries": [], "skipped": 0,
+              "etag": cached.get("etag"), "last_modified": cached.get("last_modified")}
+    if res.status_code == 304:
+        return result
+    res.raise_for_status()
+
+    seen = set(cached.get("seen", []))
+    # XML 파싱은 이벤트 루프를 막지 않도록 스레드에서
+    feed = await asyncio.to_thread(feedparser.parse, res.content)
+    for entry in feed.entries:
+        if entry.get("links") and entry.links[0].href in seen:
+            result["skipped"] += 1
+            continue
+        result["entries"].append(entry)
+    result["etag"] = res.headers.get("ETag")
+    result["last_modified"] = res.headers.get("Last-Modified")
+    return result
+
+
+async def fetch_feeds(keywords_dict: dict, state: dict, concurrency: int = DEFAULT_CONCURRENCY) -> list:
+    """모든 (섹터, 키워드) 피드를 연결 풀 하나로 동시에 받음 — 실패한 키워드는 예외 객체로 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers={"User-Agent": "Mozilla/5.0"}, limits=limits, timeout=30, follow_redirects=True) as client:
+        async def fetch_one(sector, keyword):
+            async with semaphore:
+                try:
+                    return await fetch_feed(client, sector, keyword, state)
+                except Exception as e:
+                    return sector, keyword, e
+
+        return await asyncio.gather(*(
+            fetch_one(sector, keyword)
+            for sector, keywords in keywords_dict.items()
+            for keyword in keywords
+        ))
+
+
+def remember_validators(state: dict, result: dict):
+    """피드 응답의 ETag / Last-Modified 를 상태에 기록"""
+    entry = state.setdefault(_state_key(result["sector"], result["keyword"]), {})
+    entry["etag"] = result["etag"]
+    entry["last_modified"] = result["last_modified"]